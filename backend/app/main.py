@@ -3,7 +3,9 @@ from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 import os
 import logging
-from app.routers import content, media_verify, search_factcheck
+from app.routers import content, media_verify, search_factcheck, text_bias
+from app.services.database import close_databases
+from app.services.http_client import get_http_client
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -28,6 +30,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Close pooled HTTP and database connections on shutdown
+@app.on_event("shutdown")
+async def close_http_client():
+    await get_http_client().close()
+    close_databases()
+
 # Root endpoint
 @app.get("/")
 async def root():
@@ -42,6 +50,7 @@ async def health_check():
 app.include_router(content.router, prefix="/api/v1", tags=["content"])
 app.include_router(media_verify.router, prefix="/api/v1", tags=["media"])
 app.include_router(search_factcheck.router, prefix="/api/v1", tags=["fact-check"])
+app.include_router(text_bias.router, prefix="/api/v1", tags=["bias"])
 
 if __name__ == "__main__":
     import uvicorn
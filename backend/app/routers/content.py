@@ -1,5 +1,5 @@
 from fastapi import APIRouter, HTTPException, UploadFile, File
-from typing import Dict
+from typing import Dict, Literal
 from ..services.content_analyzer import ContentAnalyzer
 from pydantic import BaseModel, HttpUrl
 
@@ -14,15 +14,41 @@ class URLRequest(BaseModel):
     url: HttpUrl
 
 @router.post("/analyze/url")
-async def analyze_url(request: URLRequest) -> Dict:
-    """Analyze content from a URL."""
+async def analyze_url(
+    request: URLRequest,
+    embeddings: Literal["none", "base64", "list"] = "none"
+) -> Dict:
+    """
+    Analyze content from a URL.
+
+    Image embeddings are omitted unless ``embeddings`` is ``base64``
+    (float16 blob) or ``list`` (list of floats).
+    """
     try:
         analyzer = get_content_analyzer()
-        result = await analyzer.analyze_url(str(request.url))
+        result = await analyzer.analyze_url(str(request.url), embeddings=embeddings)
         return result
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+@router.get("/analyze/cache_stats")
+async def get_cache_stats() -> Dict:
+    """Get hit rate and eviction statistics for the image analysis cache."""
+    try:
+        analyzer = get_content_analyzer()
+        return analyzer.get_cache_stats()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@router.get("/analyze/model_status")
+async def get_model_status() -> Dict:
+    """Get image model availability and startup timings."""
+    try:
+        analyzer = get_content_analyzer()
+        return analyzer.get_model_status()
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/analyze/image")
 async def analyze_image(file: UploadFile = File(...)) -> Dict:
     """Analyze an uploaded image."""
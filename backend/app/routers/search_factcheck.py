@@ -1,15 +1,20 @@
 from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, List, Optional
+from pydantic import BaseModel, Field
+from typing import Dict, Any, List, Literal, Optional
+from app.services.claim_extractor import extract_claims
 from app.services.factcheck_service import FactCheckService
 
 router = APIRouter()
 factcheck_service = FactCheckService()
 
+# Most claims looked up for one article
+MAX_ARTICLE_CLAIMS = 50
+
 class FactCheckQuery(BaseModel):
     text: str
     source_url: Optional[str] = None
     max_results: int = 5
+    mode: Literal["lexical", "semantic"] = "lexical"
 
 class FactCheckResult(BaseModel):
     claim: str
@@ -36,12 +41,60 @@ async def search_factcheck(query: FactCheckQuery) -> List[Dict[str, Any]]:
         results = await factcheck_service.search_claims(
             query.text,
             source_url=query.source_url,
-            max_results=query.max_results
+            max_results=query.max_results,
+            mode=query.mode
         )
         return results
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class ArticleFactCheckQuery(BaseModel):
+    text: str
+    source_url: Optional[str] = None
+    max_claims: int = Field(20, ge=1, le=MAX_ARTICLE_CLAIMS)
+    max_results: int = Field(3, ge=1, le=20)
+    mode: Literal["lexical", "semantic"] = "lexical"
+
+class ClaimMatches(BaseModel):
+    claim: str
+    check_worthiness: float
+    matches: List[FactCheckResult]
+
+class ArticleFactCheckResponse(BaseModel):
+    claims: List[ClaimMatches]
+
+@router.post("/search_factcheck_article", response_model=ArticleFactCheckResponse)
+async def search_factcheck_article(query: ArticleFactCheckQuery) -> Dict[str, Any]:
+    """
+    Find fact checks for the check-worthy claims in a whole article.
+    
+    The article is split into sentences, the ones stating checkable facts
+    (figures, comparisons, attributed statements) are kept, and all of
+    them are looked up in one batched search.
+    
+    Args:
+        query: ArticleFactCheckQuery with the article text
+        
+    Returns:
+        The extracted claims in article order, each with its matching fact checks
+    """
+    try:
+        claims = extract_claims(query.text, max_claims=query.max_claims)
+        results = await factcheck_service.search_claims_many(
+            [claim for claim, _ in claims],
+            source_url=query.source_url,
+            max_results=query.max_results,
+            mode=query.mode
+        )
+        return {
+            "claims": [
+                {"claim": claim, "check_worthiness": score, "matches": matches}
+                for (claim, score), matches in zip(claims, results)
+            ]
+        }
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.get("/factcheck_sources")
 async def get_factcheck_sources() -> Dict[str, List[Dict[str, str]]]:
     """
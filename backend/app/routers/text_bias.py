@@ -1,11 +1,22 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import Dict, Any, List, Union, Optional
+from fastapi import APIRouter, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ValidationError
+from typing import Dict, Any, AsyncIterator, List, Union, Optional
+import asyncio
+import json
+import logging
+import os
 from app.services.bias_detector import BiasDetector
 
+logger = logging.getLogger(__name__)
+
 router = APIRouter()
 bias_detector = BiasDetector()
 
+# Bulk NDJSON scoring: lines per model batch and the longest accepted line
+STREAM_BATCH_SIZE = int(os.getenv("BIAS_STREAM_BATCH_SIZE", "64"))
+STREAM_MAX_LINE_BYTES = int(os.getenv("BIAS_STREAM_MAX_LINE_BYTES", str(1024 * 1024)))
+
 class TextInput(BaseModel):
     text: str
     source_url: Optional[str] = None
@@ -34,6 +45,33 @@ async def detect_bias(input_data: TextInput) -> Dict[str, Any]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class SectionBias(BaseModel):
+    start_char: int
+    end_char: int
+    bias_category: str
+    confidence: float
+
+class DocumentBiasResponse(BiasResponse):
+    windows: int
+    sections: List[SectionBias]
+
+@router.post("/detect_bias_document", response_model=DocumentBiasResponse)
+async def detect_bias_document(input_data: TextInput) -> Dict[str, Any]:
+    """
+    Analyze a full-length article for bias using overlapping token windows.
+    
+    Args:
+        input_data: TextInput object containing the document to analyze
+        
+    Returns:
+        DocumentBiasResponse with the document-level result and per-section scores
+    """
+    try:
+        result = await bias_detector.analyze_document(input_data.text)
+        return result
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
 @router.post("/batch_detect_bias")
 async def batch_detect_bias(texts: List[TextInput]) -> List[BiasResponse]:
     """
@@ -51,6 +89,119 @@ async def batch_detect_bias(texts: List[TextInput]) -> List[BiasResponse]:
     except Exception as e:
         raise HTTPException(status_code=500, detail=str(e))
 
+class BulkTextInput(TextInput):
+    id: Optional[Union[str, int]] = None
+
+class DuplexStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that leaves ``receive`` to the body iterator.
+
+    The stock response listens for a client disconnect while streaming,
+    which consumes the request body messages; here the iterator is still
+    reading the request body while results are sent.
+    """
+    async def __call__(self, scope, receive, send):
+        await self.stream_response(send)
+        if self.background is not None:
+            await self.background()
+
+def _parse_line(line_number: int, line: bytes) -> Union[BulkTextInput, Dict[str, Any]]:
+    """Parse one NDJSON input line, or return the error record for it"""
+    try:
+        return BulkTextInput.model_validate_json(line)
+    except ValidationError as e:
+        return {"line": line_number, "error": f"Invalid input: {e.errors()[0]['msg']}"}
+
+async def _read_ndjson_batches(request: Request, queue: asyncio.Queue):
+    """
+    Parse the request body line by line and queue batches of parsed lines.
+
+    The queue is bounded, so reading stops (and TCP backpressure reaches the
+    client) while earlier batches are still being scored.
+    """
+    buffer = bytearray()
+    batch = []
+    line_number = 0
+    try:
+        async for chunk in request.stream():
+            buffer.extend(chunk)
+            while True:
+                newline = buffer.find(b"\n")
+                if newline < 0:
+                    break
+                line = bytes(buffer[:newline]).strip()
+                del buffer[:newline + 1]
+                line_number += 1
+                if line:
+                    batch.append((line_number, _parse_line(line_number, line)))
+                if len(batch) >= STREAM_BATCH_SIZE:
+                    await queue.put(batch)
+                    batch = []
+            if len(buffer) > STREAM_MAX_LINE_BYTES:
+                raise ValueError(f"Line {line_number + 1} is longer than {STREAM_MAX_LINE_BYTES} bytes")
+
+        line = bytes(buffer).strip()
+        if line:
+            line_number += 1
+            batch.append((line_number, _parse_line(line_number, line)))
+        if batch:
+            await queue.put(batch)
+        await queue.put(None)
+    except Exception as e:
+        await queue.put(e)
+
+async def _score_ndjson(request: Request) -> AsyncIterator[bytes]:
+    """Score queued batches as they arrive and yield one NDJSON chunk per batch"""
+    queue: asyncio.Queue = asyncio.Queue(maxsize=2)
+    reader = asyncio.create_task(_read_ndjson_batches(request, queue))
+    try:
+        while True:
+            batch = await queue.get()
+            if batch is None:
+                break
+            if isinstance(batch, Exception):
+                yield (json.dumps({"error": str(batch)}) + "\n").encode()
+                break
+
+            inputs = [(n, entry) for n, entry in batch if isinstance(entry, BulkTextInput)]
+            results: Dict[int, Dict[str, Any]] = {
+                n: entry for n, entry in batch if not isinstance(entry, BulkTextInput)
+            }
+            if inputs:
+                try:
+                    scored = await bias_detector.analyze_batch([entry.text for _, entry in inputs])
+                    for (n, entry), result in zip(inputs, scored):
+                        results[n] = {"line": n, "id": entry.id, **result}
+                except Exception as e:
+                    logger.error(f"Bulk bias scoring failed for {len(inputs)} lines: {str(e)}")
+                    for n, entry in inputs:
+                        results[n] = {"line": n, "id": entry.id, "error": str(e)}
+
+            yield "".join(json.dumps(results[n]) + "\n" for n, _ in batch).encode()
+    finally:
+        reader.cancel()
+
+@router.post("/detect_bias_stream")
+async def detect_bias_stream(request: Request) -> StreamingResponse:
+    """
+    Score an NDJSON stream of texts for bias, streaming NDJSON results back.
+    
+    Each input line is an object with ``text`` and optionally ``id`` and
+    ``source_url``. Lines are scored in batches as they arrive, and each
+    result line carries the input ``line`` number and ``id`` together with
+    the usual BiasResponse fields (or an ``error``). Only a couple of
+    batches are held at a time, so memory stays bounded however long the
+    input is; clients should read results while they are still sending.
+    """
+    return DuplexStreamingResponse(_score_ndjson(request), media_type="application/x-ndjson")
+
+@router.get("/bias_stats")
+async def get_bias_stats() -> Dict[str, Any]:
+    """
+    Get request queue depth and batch-size histograms for bias detection.
+    """
+    return bias_detector.get_stats()
+
 @router.get("/bias_categories")
 async def get_bias_categories() -> Dict[str, str]:
     """
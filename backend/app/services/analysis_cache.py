@@ -0,0 +1,220 @@
+import json
+import logging
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class AnalysisCache:
+    """
+    Persistent key/value cache for image analysis results backed by SQLite.
+
+    Entries are looked up by primary key, expire after ``ttl_seconds`` and are
+    evicted least-recently-used first once the cache grows past
+    ``max_entries`` or ``max_bytes``. Besides the JSON value, each entry can
+    carry an optional binary blob (e.g. an encoded embedding) that is stored
+    and evicted together with it. The database runs in WAL mode so several
+    worker processes can share one cache file.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        ttl_seconds: float = 7 * 24 * 3600,
+        max_entries: int = 10000,
+        max_bytes: int = 512 * 1024 * 1024
+    ):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+
+        self._lock = threading.Lock()
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "writes": 0,
+            "evictions": 0,
+            "expirations": 0
+        }
+
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create the cache table and switch the database to WAL mode"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.execute("""
+                CREATE TABLE IF NOT EXISTS cache_entries (
+                    key TEXT PRIMARY KEY,
+                    value TEXT NOT NULL,
+                    blob BLOB,
+                    size INTEGER NOT NULL,
+                    created_at REAL NOT NULL,
+                    accessed_at REAL NOT NULL
+                )
+            """)
+            self._conn.execute(
+                "CREATE INDEX IF NOT EXISTS idx_cache_entries_accessed ON cache_entries(accessed_at)"
+            )
+            columns = [row[1] for row in self._conn.execute("PRAGMA table_info(cache_entries)")]
+            if "blob" not in columns:
+                self._conn.execute("ALTER TABLE cache_entries ADD COLUMN blob BLOB")
+
+    def contains(self, key: str) -> bool:
+        """Check for a live entry without counting a lookup or touching its LRU position"""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT created_at FROM cache_entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+        if row is None:
+            return False
+        return not (self.ttl_seconds and time.time() - row[0] > self.ttl_seconds)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value for ``key`` or None on a miss"""
+        entry = self.get_with_blob(key)
+        return entry[0] if entry is not None else None
+
+    def get_with_blob(self, key: str) -> Optional[Tuple[Any, Optional[bytes]]]:
+        """Return ``(value, blob)`` for ``key`` or None on a miss"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, blob, created_at FROM cache_entries WHERE key = ?",
+                (key,)
+            ).fetchone()
+
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+
+            value, blob, created_at = row
+            if self.ttl_seconds and now - created_at > self.ttl_seconds:
+                self._conn.execute("DELETE FROM cache_entries WHERE key = ?", (key,))
+                self._stats["expirations"] += 1
+                self._stats["misses"] += 1
+                return None
+
+            self._conn.execute(
+                "UPDATE cache_entries SET accessed_at = ? WHERE key = ?",
+                (now, key)
+            )
+            self._stats["hits"] += 1
+
+        return json.loads(value), blob
+
+    def set(self, key: str, value: Any, blob: Optional[bytes] = None):
+        """Store ``value`` (and optional ``blob``) under ``key``, evicting old entries if over budget"""
+        payload = json.dumps(value)
+        size = len(payload) + (len(blob) if blob else 0)
+        now = time.time()
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute("""
+                    INSERT OR REPLACE INTO cache_entries (key, value, blob, size, created_at, accessed_at)
+                    VALUES (?, ?, ?, ?, ?, ?)
+                """, (key, payload, blob, size, now, now))
+                self._evict(now)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._stats["writes"] += 1
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least-recently-used ones until within limits"""
+        if self.ttl_seconds:
+            cursor = self._conn.execute(
+                "DELETE FROM cache_entries WHERE created_at < ?",
+                (now - self.ttl_seconds,)
+            )
+            self._stats["expirations"] += max(cursor.rowcount, 0)
+
+        count, total_size = self._conn.execute(
+            "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+        ).fetchone()
+
+        if count <= self.max_entries and total_size <= self.max_bytes:
+            return
+
+        evicted = 0
+        while count > 1 and (count > self.max_entries or total_size > self.max_bytes):
+            # Walk the accessed_at index oldest-first in small chunks
+            rows = self._conn.execute(
+                "SELECT key, size FROM cache_entries ORDER BY accessed_at ASC LIMIT 64"
+            ).fetchall()
+            victims = []
+            for key, size in rows:
+                if count <= 1 or (count <= self.max_entries and total_size <= self.max_bytes):
+                    break
+                victims.append((key,))
+                count -= 1
+                total_size -= size
+            if not victims:
+                break
+            self._conn.executemany("DELETE FROM cache_entries WHERE key = ?", victims)
+            evicted += len(victims)
+
+        self._stats["evictions"] += evicted
+
+    def clear(self):
+        """Remove every entry from the cache"""
+        with self._lock:
+            self._conn.execute("DELETE FROM cache_entries")
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss/eviction counters and current cache size"""
+        with self._lock:
+            count, total_size = self._conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM cache_entries"
+            ).fetchone()
+            stats = dict(self._stats)
+
+        lookups = stats["hits"] + stats["misses"]
+        stats.update({
+            "entries": count,
+            "size_bytes": total_size,
+            "max_entries": self.max_entries,
+            "max_bytes": self.max_bytes,
+            "hit_rate": stats["hits"] / lookups if lookups else 0.0
+        })
+        return stats
+
+    def import_json(self, json_path: Path) -> int:
+        """
+        Import entries from the legacy ``analysis_cache.json`` file.
+
+        Returns the number of imported entries.
+        """
+        json_path = Path(json_path)
+        try:
+            with open(json_path, 'r') as f:
+                legacy = json.load(f)
+        except Exception as e:
+            logger.error(f"Error reading legacy cache {json_path}: {str(e)}")
+            return 0
+
+        imported = 0
+        for key, value in legacy.get('image_analysis', {}).items():
+            self.set(key, value)
+            imported += 1
+        return imported
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,166 @@
+import hashlib
+import inspect
+import json
+import logging
+import os
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import numpy as np
+import torch
+
+logger = logging.getLogger(__name__)
+
+
+def model_fingerprint(model_source: str) -> str:
+    """Identify a model by its files' names, sizes and mtimes (or by its hub name)"""
+    digest = hashlib.sha256(model_source.encode())
+    source = Path(model_source)
+    if source.exists():
+        paths = sorted(p for p in source.rglob("*") if p.is_file()) if source.is_dir() else [source]
+        for path in paths:
+            stat = path.stat()
+            digest.update(f"{path.name}:{stat.st_size}:{stat.st_mtime_ns}".encode())
+    return digest.hexdigest()
+
+
+class TorchBackend:
+    """Eager PyTorch inference; batches are padded to their longest sequence"""
+
+    name = "torch"
+
+    def __init__(self, model: torch.nn.Module, device: torch.device):
+        self.model = model
+        self.device = device
+
+    def padded_length(self, length: int) -> int:
+        return length
+
+    def predict(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Return softmax probabilities for a padded batch of tokenized inputs"""
+        inputs = {name: torch.from_numpy(array).to(self.device) for name, array in inputs.items()}
+        with torch.no_grad():
+            outputs = self.model(**inputs)
+            return torch.softmax(outputs.logits, dim=1).cpu().numpy()
+
+
+class OnnxBackend:
+    """
+    ONNX Runtime inference on CPU.
+
+    The PyTorch model is exported to ONNX once and the artifact is cached
+    next to the source model together with a fingerprint of it, so it is
+    re-exported only when the model changes. Batches are padded up to one of
+    a fixed set of sequence-length buckets so ONNX Runtime sees a small,
+    stable set of input shapes.
+    """
+
+    name = "onnx"
+
+    def __init__(
+        self,
+        model: torch.nn.Module,
+        model_source: str,
+        artifact_path: Path,
+        input_names: List[str],
+        length_buckets: List[int],
+        quantize: bool = False,
+        num_threads: Optional[int] = None
+    ):
+        # Optional dependency, only needed for BIAS_BACKEND=onnx
+        import onnxruntime as ort
+
+        # Graph inputs follow the order of the model's forward() signature
+        parameters = inspect.signature(model.forward).parameters
+        self.input_names = [name for name in parameters if name in input_names]
+        self.length_buckets = sorted(length_buckets)
+
+        artifact_path = Path(artifact_path)
+        fingerprint = model_fingerprint(model_source)
+        if not self._is_current(artifact_path, fingerprint):
+            self._export(model, artifact_path, fingerprint)
+
+        if quantize:
+            artifact_path = self._quantized(artifact_path, fingerprint)
+        self.artifact_path = artifact_path
+
+        options = ort.SessionOptions()
+        options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            str(artifact_path),
+            sess_options=options,
+            providers=["CPUExecutionProvider"]
+        )
+        logger.info(f"Loaded ONNX bias model from {artifact_path}")
+
+    def padded_length(self, length: int) -> int:
+        """Round a sequence length up to the nearest bucket"""
+        for bucket in self.length_buckets:
+            if length <= bucket:
+                return bucket
+        return length
+
+    def predict(self, inputs: Dict[str, np.ndarray]) -> np.ndarray:
+        """Return softmax probabilities for a padded batch of tokenized inputs"""
+        feed = {name: inputs[name] for name in self.input_names}
+        logits = self.session.run(["logits"], feed)[0]
+        logits = logits - logits.max(axis=1, keepdims=True)
+        exp = np.exp(logits)
+        return exp / exp.sum(axis=1, keepdims=True)
+
+    @staticmethod
+    def _metadata_path(artifact_path: Path) -> Path:
+        return artifact_path.with_name(artifact_path.name + ".json")
+
+    def _is_current(self, artifact_path: Path, fingerprint: str) -> bool:
+        try:
+            with open(self._metadata_path(artifact_path), 'r') as f:
+                metadata = json.load(f)
+        except Exception:
+            return False
+        return artifact_path.exists() and metadata.get("fingerprint") == fingerprint
+
+    def _export(self, model: torch.nn.Module, artifact_path: Path, fingerprint: str):
+        """Export the sequence classifier with dynamic batch and sequence axes"""
+        logger.info(f"Exporting bias model to ONNX at {artifact_path}")
+        artifact_path.parent.mkdir(parents=True, exist_ok=True)
+
+        model = model.to("cpu").eval()
+        dummy = {name: torch.ones((1, 8), dtype=torch.long) for name in self.input_names}
+        dynamic_axes = {name: {0: "batch", 1: "sequence"} for name in self.input_names}
+        dynamic_axes["logits"] = {0: "batch"}
+
+        tmp_path = artifact_path.with_name(artifact_path.name + ".tmp")
+        with torch.no_grad():
+            torch.onnx.export(
+                model,
+                (dummy,),
+                str(tmp_path),
+                input_names=self.input_names,
+                output_names=["logits"],
+                dynamic_axes=dynamic_axes,
+                opset_version=14
+            )
+        os.replace(tmp_path, artifact_path)
+
+        with open(self._metadata_path(artifact_path), 'w') as f:
+            json.dump({"fingerprint": fingerprint, "input_names": self.input_names}, f)
+
+    def _quantized(self, artifact_path: Path, fingerprint: str) -> Path:
+        """Return a dynamically int8-quantized copy of the artifact, creating it if stale"""
+        from onnxruntime.quantization import QuantType, quantize_dynamic
+
+        quantized_path = artifact_path.with_name(artifact_path.stem + ".int8.onnx")
+        if not self._is_current(quantized_path, fingerprint):
+            logger.info(f"Quantizing ONNX bias model to {quantized_path}")
+            quantize_dynamic(str(artifact_path), str(quantized_path), weight_type=QuantType.QInt8)
+            with open(self._metadata_path(quantized_path), 'w') as f:
+                json.dump({"fingerprint": fingerprint, "input_names": self.input_names}, f)
+        return quantized_path
+
+
+def parse_length_buckets(value: str) -> List[int]:
+    """Parse a comma separated list of sequence-length buckets"""
+    return sorted({int(part) for part in value.split(",") if part.strip()})
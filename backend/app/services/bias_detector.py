@@ -1,14 +1,30 @@
 import torch
 from transformers import AutoTokenizer, AutoModelForSequenceClassification
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Optional, Tuple
 import numpy as np
+import asyncio
+import logging
+import os
+import re
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
+from app.services.bias_backends import OnnxBackend, TorchBackend, model_fingerprint, parse_length_buckets
+from app.services.bias_result_cache import BiasResultCache
+from app.services.keyword_extractor import KeywordExtractor
+from app.services.micro_batcher import MicroBatcher
+from app.services.tokenization_cache import TokenizationCache
+
+logger = logging.getLogger(__name__)
 
 class BiasDetector:
     def __init__(self):
         self.device = torch.device("cuda" if torch.cuda.is_available() else "cpu")
         self.model_path = Path("app/models/bias_model.pt")
         self.tokenizer_path = Path("app/models/bias_tokenizer")
+        # Exported ONNX graph is cached next to the PyTorch model
+        self.onnx_path = self.model_path.with_suffix(".onnx")
         self.categories = {
             0: "left",
             1: "right", 
@@ -16,8 +32,79 @@ class BiasDetector:
             3: "sensationalist",
             4: "neutral"
         }
+        self.max_length = 512
+        # Batches are capped by padded tokens (batch size x longest sequence)
+        # as well as by count, so long texts don't blow up memory
+        self.max_tokens_per_batch = int(os.getenv("BIAS_MAX_TOKENS_PER_BATCH", "8192"))
+        self.max_batch_size = int(os.getenv("BIAS_MAX_BATCH_SIZE", "64"))
+        # Overlap between consecutive windows in long-document mode
+        self.window_overlap = int(os.getenv("BIAS_WINDOW_OVERLAP", "128"))
+        
+        # Inference runs in a dedicated thread pool so it never blocks the
+        # event loop. torch releases the GIL during the forward pass, so
+        # workers x intra-op threads should roughly match the core count.
+        self.num_workers = int(os.getenv("BIAS_INFERENCE_WORKERS", "1"))
+        torch_threads = os.getenv("BIAS_TORCH_THREADS")
+        if torch_threads:
+            torch.set_num_threads(int(torch_threads))
+        logger.info(
+            f"Bias inference: {self.num_workers} worker(s) x {torch.get_num_threads()} torch thread(s)"
+        )
+        self.executor = ThreadPoolExecutor(
+            max_workers=self.num_workers,
+            thread_name_prefix="bias-inference"
+        )
+        # Fast tokenizers are not safe to call from several threads at once
+        self._tokenizer_lock = threading.Lock()
+        # Tokenized inputs of recently seen texts, bounded by total tokens
+        self.tokenization_cache = TokenizationCache(
+            max_tokens=int(os.getenv("BIAS_TOKENIZATION_CACHE_TOKENS", "1000000"))
+        )
+        # Cumulative wall time split between tokenization/padding and the model
+        self._timings = {
+            "tokenization_s": 0.0,
+            "inference_s": 0.0,
+            "texts_tokenized": 0,
+            "inference_batches": 0
+        }
+        self._timings_lock = threading.Lock()
+        
+        # Concurrent single-text requests are grouped into one model batch,
+        # waiting at most BIAS_MICROBATCH_WAIT_MS for company
+        self.request_batcher = MicroBatcher(
+            self._analyze_texts,
+            max_batch_size=int(os.getenv("BIAS_MICROBATCH_MAX_SIZE", "32")),
+            max_wait_ms=float(os.getenv("BIAS_MICROBATCH_WAIT_MS", "5")),
+            name="bias_detection",
+            executor=self.executor,
+            concurrency=self.num_workers
+        )
+        # Optional dynamic int8 quantization of the Linear layers (CPU only)
+        self.quantization = os.getenv("BIAS_QUANTIZATION", "none").lower()
+        if self.quantization not in ("none", "int8"):
+            raise ValueError(f"Unsupported BIAS_QUANTIZATION: {self.quantization}")
+        # Inference backend: eager PyTorch or ONNX Runtime on CPU
+        self.backend_name = os.getenv("BIAS_BACKEND", "torch").lower()
+        if self.backend_name not in ("torch", "onnx"):
+            raise ValueError(f"Unsupported BIAS_BACKEND: {self.backend_name}")
+        self.onnx_length_buckets = parse_length_buckets(
+            os.getenv("BIAS_ONNX_LENGTH_BUCKETS", "64,128,256,512")
+        )
+        # Results are cached by content hash so repeated texts skip inference
+        self.result_cache_mode = os.getenv("BIAS_RESULT_CACHE", "on").lower()
+        if self.result_cache_mode not in ("on", "off"):
+            raise ValueError(f"Unsupported BIAS_RESULT_CACHE: {self.result_cache_mode}")
+        
+        # TF-IDF keywords against corpus statistics from scripts/build_keyword_idf.py
+        self.keyword_extractor = KeywordExtractor(
+            Path(os.getenv("BIAS_KEYWORD_IDF_PATH", "cache/keyword_idf.npz")),
+            top_k=int(os.getenv("BIAS_KEYWORDS_TOP_K", "5"))
+        )
+        
         # Initialize model and tokenizer
         self._load_model()
+        self._create_backend()
+        self._initialize_result_cache()
         
         # Define bias categories
 
@@ -25,20 +112,86 @@ class BiasDetector:
     def _load_model(self):
         """Load the pre-trained model and tokenizer"""
         try:
-            self.tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_path)
+            self.tokenizer = AutoTokenizer.from_pretrained(self.tokenizer_path, use_fast=True)
             self.model = AutoModelForSequenceClassification.from_pretrained(self.model_path)
+            self.model_source = str(self.model_path)
             self.model.to(self.device)
             self.model.eval()
         except Exception as e:
             print(f"Error loading model: {e}")
             # Initialize with default model for development
-            self.tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased")
+            self.tokenizer = AutoTokenizer.from_pretrained("bert-base-uncased", use_fast=True)
             self.model = AutoModelForSequenceClassification.from_pretrained(
                 "bert-base-uncased",
                 num_labels=len(self.categories)
             )
+            self.model_source = "bert-base-uncased"
             self.model.to(self.device)
             self.model.eval()
+        
+        # The slow Python tokenizers are many times slower on batches and
+        # lack offset mappings, which long-document mode relies on
+        if not self.tokenizer.is_fast:
+            raise RuntimeError(
+                f"Bias model needs a fast (Rust) tokenizer, got {type(self.tokenizer).__name__}; "
+                f"install the tokenizers package or add tokenizer.json to {self.tokenizer_path}"
+            )
+
+    def _apply_quantization(self):
+        """Swap the model's Linear layers for dynamically quantized int8 ones if configured"""
+        if self.quantization != "int8":
+            return
+        if self.device.type != "cpu":
+            logger.warning("BIAS_QUANTIZATION=int8 is only supported on CPU, keeping fp32 model")
+            self.quantization = "none"
+            return
+        self.model = torch.quantization.quantize_dynamic(
+            self.model,
+            {torch.nn.Linear},
+            dtype=torch.qint8
+        )
+        self.model.eval()
+        logger.info("Bias model quantized to dynamic int8")
+
+    def _create_backend(self):
+        """Set up the configured inference backend around the loaded model"""
+        if self.backend_name == "onnx":
+            torch_threads = os.getenv("BIAS_TORCH_THREADS")
+            self.backend = OnnxBackend(
+                self.model,
+                model_source=self.model_source,
+                artifact_path=self.onnx_path,
+                input_names=self.tokenizer.model_input_names,
+                length_buckets=self.onnx_length_buckets,
+                quantize=self.quantization == "int8",
+                num_threads=int(torch_threads) if torch_threads else None
+            )
+            # ONNX Runtime holds its own copy of the weights
+            self.model = None
+        else:
+            self._apply_quantization()
+            self.backend = TorchBackend(self.model, self.device)
+        logger.info(f"Bias inference backend: {self.backend.name}")
+
+    def _initialize_result_cache(self):
+        """Open the bias_analysis-backed result cache, keyed to this exact model setup"""
+        self.result_cache = None
+        if self.result_cache_mode == "off":
+            return
+        # Backends and quantization give slightly different scores, and the
+        # keyword table changes the keywords, so they are part of the version
+        self.model_version = (
+            f"{model_fingerprint(self.model_source)[:16]}-{self.backend.name}-{self.quantization}"
+            f"-kw{self.keyword_extractor.version}"
+        )
+        try:
+            self.result_cache = BiasResultCache(
+                Path(os.getenv("BIAS_RESULT_CACHE_DB", "database/news_articles.sqlite")),
+                model_version=self.model_version,
+                memory_entries=int(os.getenv("BIAS_RESULT_CACHE_MEMORY_ENTRIES", "4096"))
+            )
+        except Exception as e:
+            logger.error(f"Error opening bias result cache, continuing without it: {str(e)}")
 
     async def analyze_text(self, text: str) -> Dict[str, Any]:
         """
@@ -50,29 +203,318 @@ class BiasDetector:
         Returns:
             Dictionary containing bias analysis results
         """
-        # Tokenize and prepare input
-        inputs = self.tokenizer(
-            text,
-            return_tensors="pt",
-            truncation=True,
-            max_length=512,
-            padding=True
-        ).to(self.device)
-        
-        # Get model predictions
-        with torch.no_grad():
-            outputs = self.model(**inputs)
-            probabilities = torch.softmax(outputs.logits, dim=1)
+        return await self.request_batcher.submit(text)
+    
+    async def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """
+        Analyze multiple texts in batch.
+        
+        Args:
+            texts: List of texts to analyze
             
+        Returns:
+            List of analysis results, in the same order as ``texts``
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._analyze_texts, texts)
+    
+    def get_stats(self) -> Dict[str, Any]:
+        """Return request queue depth, batch-size histograms, cache hit rates and timings"""
+        with self._timings_lock:
+            timings = dict(self._timings)
+        stats = {
+            "request_batcher": self.request_batcher.get_stats(),
+            "tokenization_cache": self.tokenization_cache.stats(),
+            "timings": {
+                "tokenization_ms": timings["tokenization_s"] * 1000.0,
+                "inference_ms": timings["inference_s"] * 1000.0,
+                "texts_tokenized": timings["texts_tokenized"],
+                "inference_batches": timings["inference_batches"]
+            }
+        }
+        if self.result_cache is not None:
+            stats["result_cache"] = self.result_cache.stats()
+        return stats
+    
+    def _analyze_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Serve texts from the result cache where possible and run inference for the rest"""
+        if self.result_cache is None:
+            return self._infer_texts(texts)
+        
+        keys = [self.result_cache.make_key(text) for text in texts]
+        results = self.result_cache.get_many(keys)
+        
+        # Each distinct uncached text is scored once, even if repeated in the batch
+        missing: Dict[bytes, str] = {}
+        for key, text in zip(keys, texts):
+            if key not in results and key not in missing:
+                missing[key] = text
+        if missing:
+            fresh = self._infer_texts(list(missing.values()))
+            entries = [(key, missing[key], result) for key, result in zip(missing, fresh)]
+            self.result_cache.set_many(entries)
+            for key, _, result in entries:
+                results[key] = result
+        
+        return [dict(results[key]) for key in keys]
+    
+    def _infer_texts(self, texts: List[str]) -> List[Dict[str, Any]]:
+        """Score texts with batched inference and build one result per text"""
+        probabilities = self._predict_probabilities(texts)
+        keywords = self.keyword_extractor.extract_batch(texts)
+        return [
+            self._build_result(text, probs, text_keywords)
+            for text, probs, text_keywords in zip(texts, probabilities, keywords)
+        ]
+    
+    def _make_batches(self, lengths: List[int]) -> List[List[int]]:
+        """
+        Group text indices into length-bucketed batches.
+        
+        Indices are sorted by token length so each batch pads to a similar
+        length; a batch is closed when adding another text would exceed
+        ``max_tokens_per_batch`` padded tokens or ``max_batch_size`` texts.
+        """
+        order = sorted(range(len(lengths)), key=lambda i: lengths[i])
+        batches = []
+        current: List[int] = []
+        for idx in order:
+            # Sorted ascending, so this text is the longest in the batch
+            padded_tokens = (len(current) + 1) * self.backend.padded_length(lengths[idx])
+            if current and (padded_tokens > self.max_tokens_per_batch or len(current) >= self.max_batch_size):
+                batches.append(current)
+                current = []
+            current.append(idx)
+        if current:
+            batches.append(current)
+        return batches
+    
+    def _record_timing(self, name: str, seconds: float, count: int = 0):
+        with self._timings_lock:
+            self._timings[f"{name}_s"] += seconds
+            if name == "tokenization":
+                self._timings["texts_tokenized"] += count
+            else:
+                self._timings["inference_batches"] += count
+    
+    def _tokenize_texts(self, texts: List[str]) -> List[Dict[str, List[int]]]:
+        """Tokenize texts without padding, reusing cached encodings of texts seen before"""
+        keys = [TokenizationCache.make_key("text", text) for text in texts]
+        features: List[Dict[str, List[int]]] = [self.tokenization_cache.get(key) for key in keys]
+        missing = [i for i, feature in enumerate(features) if feature is None]
+        if not missing:
+            return features
+        
+        # Tokenize all uncached texts in one call
+        start = time.perf_counter()
+        with self._tokenizer_lock:
+            encodings = self.tokenizer(
+                [texts[i] for i in missing],
+                truncation=True,
+                max_length=self.max_length
+            )
+        for row, i in enumerate(missing):
+            feature = {key: encodings[key][row] for key in encodings.keys()}
+            features[i] = feature
+            self.tokenization_cache.set(keys[i], feature, len(feature["input_ids"]))
+        self._record_timing("tokenization", time.perf_counter() - start, len(missing))
+        return features
+    
+    def _predict_probabilities(self, texts: List[str]) -> List[np.ndarray]:
+        """Return per-category probabilities for each text, in input order"""
+        if not texts:
+            return []
+        return self._predict_features(self._tokenize_texts(texts))
+    
+    def _pad_batch(self, features: List[Dict[str, List[int]]], length: int) -> Dict[str, np.ndarray]:
+        """Pad tokenized inputs to ``length`` into int64 arrays, one per model input"""
+        pad_values = {
+            "input_ids": self.tokenizer.pad_token_id,
+            "token_type_ids": self.tokenizer.pad_token_type_id,
+            "attention_mask": 0
+        }
+        left = self.tokenizer.padding_side == "left"
+        arrays = {}
+        for name in features[0].keys():
+            if name not in self.tokenizer.model_input_names:
+                continue
+            array = np.full((len(features), length), pad_values.get(name, 0), dtype=np.int64)
+            for row, feature in enumerate(features):
+                values = feature[name]
+                if left:
+                    array[row, length - len(values):] = values
+                else:
+                    array[row, :len(values)] = values
+            arrays[name] = array
+        return arrays
+    
+    def _predict_features(self, features: List[Dict[str, List[int]]]) -> List[np.ndarray]:
+        """Run length-bucketed batched inference over already tokenized inputs"""
+        lengths = [len(feature["input_ids"]) for feature in features]
+        
+        probabilities: List[np.ndarray] = [None] * len(features)
+        for batch_indices in self._make_batches(lengths):
+            # Pad to the batch's longest text, rounded up to the backend's
+            # length bucket (a no-op for the torch backend)
+            padded_length = self.backend.padded_length(max(lengths[i] for i in batch_indices))
+            start = time.perf_counter()
+            inputs = self._pad_batch([features[i] for i in batch_indices], padded_length)
+            padded = time.perf_counter()
+            
+            # Get model predictions
+            batch_probs = self.backend.predict(inputs)
+            self._record_timing("tokenization", padded - start)
+            self._record_timing("inference", time.perf_counter() - padded, 1)
+            
+            for i, probs in zip(batch_indices, batch_probs):
+                probabilities[i] = probs
+        
+        return probabilities
+    
+    async def analyze_document(self, text: str) -> Dict[str, Any]:
+        """
+        Analyze a long document with overlapping token windows.
+        
+        Unlike ``analyze_text``, which only sees the first 512 tokens, the
+        whole text is scored. The text is tokenized once and cut into
+        windows of ``max_length`` tokens overlapping by
+        ``window_overlap`` tokens; all windows are scored in one batched
+        pass.
+        
+        Args:
+            text: Full document text; blank lines separate sections
+            
+        Returns:
+            The usual analysis fields for the whole document, plus the
+            number of windows and a per-section breakdown
+        """
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, self._analyze_document, text)
+    
+    def _make_windows(self, token_count: int) -> List[Tuple[int, int]]:
+        """Split ``token_count`` content tokens into overlapping [start, end) windows"""
+        window_size = self.max_length - self.tokenizer.num_special_tokens_to_add()
+        stride = max(1, window_size - self.window_overlap)
+        
+        windows = []
+        start = 0
+        while True:
+            end = min(start + window_size, token_count)
+            windows.append((start, end))
+            if end >= token_count:
+                break
+            start += stride
+        return windows
+    
+    def _analyze_document(self, text: str) -> Dict[str, Any]:
+        # One tokenizer call for the whole document; windows slice its ids
+        key = TokenizationCache.make_key("document", text)
+        encoding = self.tokenization_cache.get(key)
+        if encoding is None:
+            start = time.perf_counter()
+            with self._tokenizer_lock:
+                tokenized = self.tokenizer(
+                    text,
+                    add_special_tokens=False,
+                    return_offsets_mapping=True,
+                    return_attention_mask=False,
+                    return_token_type_ids=False
+                )
+            encoding = (tokenized["input_ids"], tokenized["offset_mapping"])
+            self.tokenization_cache.set(key, encoding, len(encoding[0]))
+            self._record_timing("tokenization", time.perf_counter() - start, 1)
+        input_ids, offsets = encoding
+        
+        windows = self._make_windows(len(input_ids))
+        features = []
+        for start, end in windows:
+            window_ids = self.tokenizer.build_inputs_with_special_tokens(input_ids[start:end])
+            feature = {
+                "input_ids": window_ids,
+                "attention_mask": [1] * len(window_ids)
+            }
+            if "token_type_ids" in self.tokenizer.model_input_names:
+                feature["token_type_ids"] = [0] * len(window_ids)
+            features.append(feature)
+        
+        window_probs = np.stack(self._predict_features(features))
+        window_weights = np.array([max(end - start, 1) for start, end in windows], dtype=np.float32)
+        
+        # Document score: windows weighted by how many tokens they cover
+        doc_probs = np.average(window_probs, axis=0, weights=window_weights)
+        result = self._build_result(text, doc_probs)
+        result["windows"] = len(windows)
+        result["sections"] = self._score_sections(text, offsets, windows, window_probs)
+        return result
+    
+    @staticmethod
+    def _section_spans(text: str) -> List[Tuple[int, int]]:
+        """Character spans of the blank-line separated sections, whitespace trimmed"""
+        boundaries = [0]
+        for separator in re.finditer(r"\n[^\S\n]*\n\s*", text):
+            boundaries.extend([separator.start(), separator.end()])
+        boundaries.append(len(text))
+        
+        spans = []
+        for start, end in zip(boundaries[::2], boundaries[1::2]):
+            chunk = text[start:end]
+            stripped = chunk.strip()
+            if stripped:
+                start += len(chunk) - len(chunk.lstrip())
+                spans.append((start, start + len(stripped)))
+        return spans
+    
+    def _score_sections(
+        self,
+        text: str,
+        offsets: List[Tuple[int, int]],
+        windows: List[Tuple[int, int]],
+        window_probs: np.ndarray
+    ) -> List[Dict[str, Any]]:
+        """
+        Score each blank-line separated section as the average of the windows
+        overlapping it, weighted by the number of shared tokens.
+        """
+        token_starts = np.array([start for start, _ in offsets], dtype=np.int64)
+        sections = []
+        for section_start, section_end in self._section_spans(text):
+            # Token range of the section from the character offsets
+            first = int(np.searchsorted(token_starts, section_start, side="left"))
+            last = int(np.searchsorted(token_starts, section_end, side="left"))
+            
+            weights = np.array([
+                max(0, min(end, last) - max(start, first))
+                for start, end in windows
+            ], dtype=np.float32)
+            if weights.sum() == 0:
+                continue
+            
+            probs = np.average(window_probs, axis=0, weights=weights)
+            pred_idx = int(np.argmax(probs))
+            sections.append({
+                "start_char": section_start,
+                "end_char": section_end,
+                "bias_category": self.categories[pred_idx],
+                "confidence": float(probs[pred_idx])
+            })
+        return sections
+    
+    def _build_result(
+        self,
+        text: str,
+        probabilities: np.ndarray,
+        keywords: Optional[List[str]] = None
+    ) -> Dict[str, Any]:
+        """Turn category probabilities for one text into an analysis result"""
         # Get predicted category and confidence
-        pred_idx = torch.argmax(probabilities).item()
-        confidence = probabilities[0][pred_idx].item()
+        pred_idx = int(np.argmax(probabilities))
+        confidence = float(probabilities[pred_idx])
         
-        # Extract keywords (placeholder - implement proper keyword extraction)
-        keywords = self._extract_keywords(text)
+        if keywords is None:
+            keywords = self._extract_keywords(text)
         
         return {
-            "bias_score": float(probabilities[0][pred_idx]),
+            "bias_score": confidence,
             "bias_category": self.categories[pred_idx],
             "confidence": confidence,
             "explanation": self._generate_explanation(
@@ -83,30 +525,11 @@ class BiasDetector:
             "keywords": keywords
         }
     
-    async def analyze_batch(self, texts: List[str]) -> List[Dict[str, Any]]:
-        """
-        Analyze multiple texts in batch.
-        
-        Args:
-            texts: List of texts to analyze
-            
-        Returns:
-            List of analysis results
-        """
-        results = []
-        for text in texts:
-            result = await self.analyze_text(text)
-            results.append(result)
-        return results
-    
     def _extract_keywords(self, text: str) -> List[str]:
         """
-        Extract relevant keywords from text.
-        This is a placeholder implementation.
+        Extract the highest TF-IDF terms of a text, best first.
         """
-        # TODO: Implement proper keyword extraction
-        words = text.lower().split()
-        return list(set(words))[:5]  # Return first 5 unique words as keywords
+        return self.keyword_extractor.extract_batch([text])[0]
     
     def _generate_explanation(
         self,
@@ -0,0 +1,170 @@
+import hashlib
+import json
+import logging
+import re
+import sqlite3
+import threading
+import unicodedata
+from collections import OrderedDict
+from datetime import datetime
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+from app.services.schema import create_bias_analysis_schema
+
+logger = logging.getLogger(__name__)
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+class BiasResultCache:
+    """
+    Content-addressed cache of bias analysis results.
+
+    Results are keyed by a 16-byte hash of the normalized text and the model
+    version, so the same story republished with different whitespace (e.g. a
+    syndicated wire story) maps to one entry, and a new model never serves
+    stale results. Entries are persisted in the ``bias_analysis`` table,
+    which is looked up through a unique index on that hash, and the most
+    recently used ones are kept in an in-memory LRU in front of it.
+    """
+
+    def __init__(self, db_path: Path, model_version: str, memory_entries: int = 4096):
+        self.db_path = Path(db_path)
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        self.model_version = model_version
+        self.memory_entries = memory_entries
+
+        self._memory: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {
+            "memory_hits": 0,
+            "db_hits": 0,
+            "misses": 0,
+            "writes": 0
+        }
+
+        self._conn = sqlite3.connect(
+            self.db_path,
+            timeout=30,
+            check_same_thread=False,
+            isolation_level=None
+        )
+        self._init_schema()
+
+    def _init_schema(self):
+        """Create the table if needed and migrate it from the full-text index to the hash index"""
+        with self._lock:
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            create_bias_analysis_schema(self._conn)
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        """Unicode-normalize and collapse whitespace so trivially different copies share a key"""
+        return _WHITESPACE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+    def make_key(self, text: str) -> bytes:
+        """Hash the normalized text together with the model version"""
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(self.model_version.encode())
+        digest.update(b"\0")
+        digest.update(self.normalize(text).encode())
+        return digest.digest()
+
+    def get_many(self, keys: List[bytes]) -> Dict[bytes, Dict[str, Any]]:
+        """Return cached results for whichever ``keys`` are known, checking memory before the table"""
+        found: Dict[bytes, Dict[str, Any]] = {}
+        with self._lock:
+            missing = []
+            for key in dict.fromkeys(keys):
+                result = self._memory.get(key)
+                if result is not None:
+                    self._memory.move_to_end(key)
+                    found[key] = dict(result)
+                    self._stats["memory_hits"] += 1
+                else:
+                    missing.append(key)
+
+            rows = []
+            # Stay well under SQLite's bound-parameter limit
+            for start in range(0, len(missing), 500):
+                chunk = missing[start:start + 500]
+                placeholders = ", ".join("?" * len(chunk))
+                rows.extend(self._conn.execute(f"""
+                    SELECT content_hash, bias_score, bias_category, confidence, explanation, keywords
+                    FROM bias_analysis WHERE content_hash IN ({placeholders})
+                """, chunk).fetchall())
+            for key, bias_score, bias_category, confidence, explanation, keywords in rows:
+                result = {
+                    "bias_score": bias_score,
+                    "bias_category": bias_category,
+                    "confidence": confidence,
+                    "explanation": explanation or "",
+                    "keywords": json.loads(keywords) if keywords else []
+                }
+                self._remember(key, result)
+                found[key] = dict(result)
+            self._stats["db_hits"] += len(rows)
+            self._stats["misses"] += len(missing) - len(rows)
+
+        return found
+
+    def set_many(self, entries: List[Tuple[bytes, str, Dict[str, Any]]]):
+        """Persist ``(key, text, result)`` entries and add them to the in-memory LRU"""
+        if not entries:
+            return
+        now = datetime.now().isoformat()
+        rows = [
+            (
+                text,
+                result["bias_score"],
+                result["bias_category"],
+                result["confidence"],
+                json.dumps(result["keywords"]),
+                now,
+                key,
+                self.model_version,
+                result["explanation"]
+            )
+            for key, text, result in entries
+        ]
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.executemany("""
+                    INSERT OR IGNORE INTO bias_analysis (
+                        text, bias_score, bias_category, confidence, keywords,
+                        created_at, content_hash, model_version, explanation
+                    ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                """, rows)
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            for key, _, result in entries:
+                self._remember(key, dict(result))
+            self._stats["writes"] += len(entries)
+
+    def _remember(self, key: bytes, result: Dict[str, Any]):
+        """Insert into the in-memory LRU, dropping the least recently used entry when full"""
+        self._memory[key] = result
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return memory/table hit counters and the hit rate"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+        lookups = stats["memory_hits"] + stats["db_hits"] + stats["misses"]
+        stats.update({
+            "model_version": self.model_version,
+            "max_memory_entries": self.memory_entries,
+            "hit_rate": (stats["memory_hits"] + stats["db_hits"]) / lookups if lookups else 0.0
+        })
+        return stats
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,94 @@
+import re
+from typing import List, Tuple
+
+# Sentence ends at ., ! or ? (plus closing quotes/brackets) followed by
+# whitespace and an uppercase letter, digit or opening quote
+_SENTENCE_END = re.compile(r"(?<=[.!?])[\"'”’)\]]*\s+(?=[\"'“‘(\[]?[A-Z0-9])")
+# Abbreviations whose trailing period does not end a sentence
+_ABBREVIATIONS = frozenset("""
+mr mrs ms dr prof sen rep gov gen col lt st jr sr vs etc inc ltd co corp dept est approx no fig
+jan feb mar apr jun jul aug sep sept oct nov dec u.s u.k e.g i.e
+""".split())
+_LAST_WORD = re.compile(r"([\w.]+)\.$")
+
+_NUMBER = re.compile(r"\d")
+_STATISTIC = re.compile(
+    r"\b(percent|per cent|million|billion|trillion|thousand|hundred|doubled|tripled|halved|"
+    r"record|highest|lowest|most|least|majority|average|rate|increase[ds]?|decrease[ds]?|"
+    r"rose|fell|grew|dropped|declined|surged|cut|more than|less than|fewer than)\b|%",
+    re.IGNORECASE
+)
+_ATTRIBUTION = re.compile(
+    r"\b(said|says|claimed|claims|stated|according to|announced|reported|alleged|told|"
+    r"insisted|denied|warned|promised|tweeted|posted)\b",
+    re.IGNORECASE
+)
+_HEDGE = re.compile(r"\b(i think|i believe|maybe|perhaps|might|could|should|would like|hopefully)\b", re.IGNORECASE)
+_PROPER_NOUN = re.compile(r"(?<!^)(?<![.!?]\s)\b[A-Z][a-z]+")
+
+MIN_CLAIM_WORDS = 6
+MAX_CLAIM_WORDS = 60
+
+
+def split_sentences(text: str) -> List[str]:
+    """Split text into sentences without breaking after common abbreviations"""
+    sentences: List[str] = []
+    for paragraph in re.split(r"\n\s*\n", text):
+        paragraph = " ".join(paragraph.split())
+        start = 0
+        for match in _SENTENCE_END.finditer(paragraph):
+            candidate = paragraph[start:match.start()]
+            last = _LAST_WORD.search(candidate)
+            if last and last.group(1).lower() in _ABBREVIATIONS:
+                continue
+            sentences.append(candidate.strip())
+            start = match.end()
+        if paragraph[start:].strip():
+            sentences.append(paragraph[start:].strip())
+    return sentences
+
+
+def check_worthiness(sentence: str) -> float:
+    """
+    Heuristic score of how likely a sentence states a checkable fact.
+
+    Numbers, statistics and comparisons, attribution to a speaker and
+    named entities raise the score; questions, hedged opinions and
+    sentences too short or long to be a single claim score zero.
+    """
+    words = len(sentence.split())
+    if words < MIN_CLAIM_WORDS or words > MAX_CLAIM_WORDS or sentence.endswith("?"):
+        return 0.0
+
+    score = 0.0
+    if _NUMBER.search(sentence):
+        score += 1.0
+    score += 0.75 * min(len(_STATISTIC.findall(sentence)), 2)
+    if _ATTRIBUTION.search(sentence):
+        score += 0.75
+    score += 0.25 * min(len(_PROPER_NOUN.findall(sentence)), 4)
+    if _HEDGE.search(sentence):
+        score -= 1.0
+    return max(score, 0.0)
+
+
+def extract_claims(text: str, max_claims: int = 20, min_score: float = 1.0) -> List[Tuple[str, float]]:
+    """
+    Check-worthy sentences of an article with their scores, in article order.
+
+    At most ``max_claims`` of the highest scoring sentences are kept;
+    repeated sentences are returned once.
+    """
+    scored = []
+    seen = set()
+    for position, sentence in enumerate(split_sentences(text)):
+        key = sentence.lower()
+        if key in seen:
+            continue
+        seen.add(key)
+        score = check_worthiness(sentence)
+        if score >= min_score:
+            scored.append((position, sentence, score))
+
+    best = sorted(scored, key=lambda item: -item[2])[:max_claims]
+    return [(sentence, score) for _, sentence, score in sorted(best)]
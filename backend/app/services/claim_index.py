@@ -0,0 +1,354 @@
+import json
+import logging
+import os
+import shutil
+import threading
+import time
+from pathlib import Path
+from typing import Callable, Iterator, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from app.services.database import get_database
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EMBEDDING_MODEL = "sentence-transformers/all-MiniLM-L6-v2"
+# Below this many claims an exact scan is fast enough and no clustering is built
+MIN_CLUSTERED_ROWS = 50000
+
+
+class IndexSnapshot(NamedTuple):
+    """Arrays of one build of the index, replaced as a whole on reload"""
+    meta: dict
+    vectors: np.ndarray
+    ids: np.ndarray
+    centroids: np.ndarray
+    offsets: np.ndarray
+    tail_vectors: np.ndarray
+    tail_ids: np.ndarray
+
+
+class ClaimIndex:
+    """
+    Memory-mapped nearest-neighbour index over fact-check claim embeddings.
+
+    Embeddings are L2-normalized float32 rows stored as ``.npy`` files and
+    opened with ``mmap_mode="r"``, so several workers share one copy through
+    the page cache and startup does not read the matrix. (float16 would halve
+    the file, but converting it back costs more than the dot products.)
+    Large indexes are split into inverted lists: rows are sorted by their
+    nearest k-means centroid and a query only scans the ``nprobe`` lists
+    closest to it.
+    Claims added or changed since the last full build live in a small tail
+    segment that is always scanned exactly; a tail row supersedes the
+    clustered row of the same id.
+
+    Files in ``directory``: ``vectors.npy``/``ids.npy`` (clustered rows),
+    ``centroids.npy`` and ``offsets.npy`` (list boundaries into the rows),
+    ``tail_vectors.npy``/``tail_ids.npy`` and ``meta.json``.
+    """
+
+    def __init__(self, directory: Path, nprobe: int = 16):
+        self.directory = Path(directory)
+        self.nprobe = nprobe
+        self._lock = threading.Lock()
+        self._loaded_version: Optional[float] = None
+        self._snapshot: Optional[IndexSnapshot] = None
+        self._reload_if_changed()
+
+    @property
+    def meta(self) -> dict:
+        snapshot = self._snapshot
+        return snapshot.meta if snapshot is not None else {}
+
+    @property
+    def available(self) -> bool:
+        self._reload_if_changed()
+        return self._snapshot is not None
+
+    def _reload_if_changed(self):
+        """Reopen the files when a build or append has replaced meta.json"""
+        meta_path = self.directory / "meta.json"
+        try:
+            version = meta_path.stat().st_mtime
+        except FileNotFoundError:
+            return
+        if version == self._loaded_version:
+            return
+
+        with self._lock:
+            if version == self._loaded_version:
+                return
+            with open(meta_path, 'r') as f:
+                meta = json.load(f)
+            snapshot = IndexSnapshot(
+                meta=meta,
+                vectors=np.load(self.directory / "vectors.npy", mmap_mode="r"),
+                ids=np.load(self.directory / "ids.npy", mmap_mode="r"),
+                centroids=np.load(self.directory / "centroids.npy"),
+                offsets=np.load(self.directory / "offsets.npy"),
+                tail_vectors=np.load(self.directory / "tail_vectors.npy"),
+                tail_ids=np.load(self.directory / "tail_ids.npy")
+            )
+            # One reference swap, so a concurrent search sees either the old
+            # or the new index, never a mix of both
+            self._snapshot = snapshot
+            self._loaded_version = version
+            logger.info(
+                f"Loaded claim index: {len(snapshot.ids)} clustered + {len(snapshot.tail_ids)} tail claims, "
+                f"{len(snapshot.centroids)} lists"
+            )
+
+    def search(self, query: np.ndarray, k: int = 5) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        Return the fact-check ids and cosine similarities of the ``k`` claims
+        closest to a normalized query embedding, best first.
+        """
+        if not self.available:
+            raise RuntimeError(f"Claim index not built in {self.directory}")
+        index = self._snapshot
+
+        query = np.asarray(query, dtype=np.float32).reshape(-1)
+        candidate_ids = []
+        candidate_scores = []
+
+        if len(index.centroids):
+            # Scan only the inverted lists whose centroids are closest
+            nprobe = min(self.nprobe, len(index.centroids))
+            lists = np.argpartition(-(index.centroids @ query), nprobe - 1)[:nprobe]
+            for cluster in lists:
+                start, end = index.offsets[cluster], index.offsets[cluster + 1]
+                if start == end:
+                    continue
+                candidate_ids.append(index.ids[start:end])
+                candidate_scores.append(index.vectors[start:end] @ query)
+        else:
+            # Small index: exact scan
+            candidate_ids.append(index.ids)
+            candidate_scores.append(index.vectors @ query)
+
+        ids = np.concatenate(candidate_ids) if candidate_ids else np.zeros(0, dtype=np.int64)
+        scores = np.concatenate(candidate_scores) if candidate_scores else np.zeros(0, dtype=np.float32)
+        if len(index.tail_ids):
+            # Claims re-embedded after a change keep only their tail vector
+            current = ~np.isin(ids, index.tail_ids)
+            ids = np.concatenate([index.tail_ids, ids[current]])
+            scores = np.concatenate([index.tail_vectors @ query, scores[current]])
+        if len(scores) > k:
+            top = np.argpartition(-scores, k - 1)[:k]
+        else:
+            top = np.arange(len(scores))
+        top = top[np.argsort(-scores[top])]
+        return np.asarray(ids[top]), scores[top]
+
+
+def _normalize(vectors: np.ndarray) -> np.ndarray:
+    vectors = np.asarray(vectors, dtype=np.float32)
+    norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors / np.maximum(norms, 1e-12)
+
+
+def train_centroids(vectors: np.ndarray, nlist: int, iterations: int = 10, sample: int = 100000) -> np.ndarray:
+    """Spherical k-means on a sample of the (normalized) vectors"""
+    rng = np.random.default_rng(0)
+    if len(vectors) > sample:
+        vectors = vectors[np.sort(rng.choice(len(vectors), sample, replace=False))]
+    vectors = np.asarray(vectors, dtype=np.float32)
+    centroids = vectors[rng.choice(len(vectors), nlist, replace=False)].copy()
+    for _ in range(iterations):
+        assignment = assign_lists(vectors, centroids)
+        sums = np.zeros_like(centroids)
+        np.add.at(sums, assignment, vectors)
+        counts = np.bincount(assignment, minlength=nlist)
+        # Empty lists are reseeded from random vectors
+        empty = counts == 0
+        sums[empty] = vectors[rng.choice(len(vectors), int(empty.sum()))]
+        centroids = _normalize(sums)
+    return centroids
+
+
+def assign_lists(vectors: np.ndarray, centroids: np.ndarray, chunk: int = 65536) -> np.ndarray:
+    """Index of the closest centroid for every vector"""
+    assignment = np.empty(len(vectors), dtype=np.int64)
+    for start in range(0, len(vectors), chunk):
+        block = np.asarray(vectors[start:start + chunk], dtype=np.float32)
+        assignment[start:start + chunk] = np.argmax(block @ centroids.T, axis=1)
+    return assignment
+
+
+def _write_atomically(directory: Path, arrays: dict, meta: dict):
+    """Write the arrays and meta.json next to the index, then swap them in"""
+    directory.mkdir(parents=True, exist_ok=True)
+    staging = directory / f".staging-{os.getpid()}"
+    staging.mkdir(exist_ok=True)
+    try:
+        for name, array in arrays.items():
+            np.save(staging / f"{name}.npy", array)
+        for name in arrays:
+            os.replace(staging / f"{name}.npy", directory / f"{name}.npy")
+        # meta.json goes last; readers reload when it changes
+        with open(staging / "meta.json", 'w') as f:
+            json.dump(meta, f)
+        os.replace(staging / "meta.json", directory / "meta.json")
+    finally:
+        shutil.rmtree(staging, ignore_errors=True)
+
+
+def build_index(
+    directory: Path,
+    ids: np.ndarray,
+    vectors: np.ndarray,
+    model: str,
+    nlist: Optional[int] = None,
+    updated_at: Optional[str] = None
+):
+    """
+    Write a fresh index; large ones are clustered into about sqrt(n)
+    inverted lists. ``updated_at`` is the newest ``updated_at`` of the
+    embedded claims, from which later updates look for changed ones.
+    """
+    vectors = _normalize(vectors)
+    ids = np.asarray(ids, dtype=np.int64)
+    dim = vectors.shape[1] if vectors.ndim == 2 else 0
+
+    if nlist is None:
+        nlist = int(np.sqrt(len(ids))) if len(ids) >= MIN_CLUSTERED_ROWS else 0
+    if nlist:
+        centroids = train_centroids(vectors, nlist)
+        assignment = assign_lists(vectors, centroids)
+        order = np.argsort(assignment, kind="stable")
+        vectors, ids = vectors[order], ids[order]
+        offsets = np.concatenate([[0], np.cumsum(np.bincount(assignment, minlength=nlist))])
+    else:
+        centroids = np.zeros((0, dim), dtype=np.float32)
+        offsets = np.zeros(1, dtype=np.int64)
+
+    _write_atomically(Path(directory), {
+        "vectors": vectors,
+        "ids": ids,
+        "centroids": centroids.astype(np.float32),
+        "offsets": offsets.astype(np.int64),
+        "tail_vectors": np.zeros((0, dim), dtype=np.float32),
+        "tail_ids": np.zeros(0, dtype=np.int64)
+    }, {
+        "model": model,
+        "dim": dim,
+        "count": int(len(ids)),
+        "max_id": int(ids.max()) if len(ids) else 0,
+        "updated_at": updated_at,
+        "built_at": time.time()
+    })
+
+
+def append_to_index(directory: Path, ids: np.ndarray, vectors: np.ndarray, updated_at: Optional[str] = None):
+    """
+    Add new or changed claims to the tail segment without touching the
+    clustered rows. A claim already in the tail has its vector replaced.
+    """
+    directory = Path(directory)
+    with open(directory / "meta.json", 'r') as f:
+        meta = json.load(f)
+    ids = np.asarray(ids, dtype=np.int64)
+    tail_ids = np.load(directory / "tail_ids.npy")
+    tail_vectors = np.load(directory / "tail_vectors.npy")
+    kept = ~np.isin(tail_ids, ids)
+    tail_ids = np.concatenate([tail_ids[kept], ids])
+    tail_vectors = np.concatenate([tail_vectors[kept], _normalize(vectors)])
+    meta["count"] += int(np.count_nonzero(ids > meta["max_id"]))
+    meta["max_id"] = max(meta["max_id"], int(np.max(ids))) if len(ids) else meta["max_id"]
+    if updated_at is not None:
+        meta["updated_at"] = max(meta.get("updated_at") or "", updated_at)
+    _write_atomically(directory, {"tail_vectors": tail_vectors, "tail_ids": tail_ids}, meta)
+
+
+def iter_claims(
+    db_path: Path,
+    after_id: int = 0,
+    updated_after: Optional[str] = None,
+    chunk: int = 1024
+) -> Iterator[List[Tuple[int, str, str]]]:
+    """
+    Stream ``(id, claim, updated_at)`` chunks of fact checks with ids above
+    ``after_id`` or, if given, updated after ``updated_after``
+    """
+    with get_database(db_path).connection() as conn:
+        if updated_after is None:
+            cursor = conn.execute(
+                "SELECT id, claim, updated_at FROM fact_checks WHERE id > ? ORDER BY id", (after_id,)
+            )
+        else:
+            cursor = conn.execute(
+                "SELECT id, claim, updated_at FROM fact_checks WHERE id > ? OR updated_at > ? ORDER BY id",
+                (after_id, updated_after)
+            )
+        while True:
+            rows = cursor.fetchmany(chunk)
+            if not rows:
+                break
+            yield rows
+
+
+def update_claim_index(
+    db_path: Path,
+    directory: Path,
+    encode: Callable[[List[str]], np.ndarray],
+    model: str,
+    rebuild: bool = False
+) -> int:
+    """
+    Embed fact checks that are not in the index yet, or whose text changed
+    since they were indexed, and add them.
+
+    The first run (or ``rebuild``) embeds every claim and builds the index;
+    later runs only embed ids above the indexed maximum and rows whose
+    ``updated_at`` is newer than the index (rewritten by an upsert), and
+    append them to the tail. Returns the number of claims embedded.
+    """
+    directory = Path(directory)
+    meta_path = directory / "meta.json"
+    meta = None
+    if meta_path.exists() and not rebuild:
+        with open(meta_path, 'r') as f:
+            meta = json.load(f)
+        if meta.get("model") != model:
+            logger.info(f"Claim index was built with {meta.get('model')}, rebuilding for {model}")
+            meta = None
+        elif "updated_at" not in meta:
+            logger.info("Claim index does not track changed claims yet, rebuilding")
+            meta = None
+
+    ids: List[np.ndarray] = []
+    vectors: List[np.ndarray] = []
+    updated_at = None
+    for rows in iter_claims(db_path, meta["max_id"] if meta else 0, meta["updated_at"] if meta else None):
+        ids.append(np.array([row[0] for row in rows], dtype=np.int64))
+        vectors.append(np.asarray(encode([row[1] for row in rows]), dtype=np.float32))
+        updated_at = max([updated_at or ""] + [row[2] or "" for row in rows]) or None
+
+    if meta is None:
+        if not ids:
+            return 0
+        build_index(directory, np.concatenate(ids), np.concatenate(vectors), model, updated_at=updated_at)
+    elif ids:
+        append_to_index(directory, np.concatenate(ids), np.concatenate(vectors), updated_at)
+    return int(sum(len(chunk) for chunk in ids))
+
+
+def create_encoder(model_name: str) -> Callable[[List[str]], np.ndarray]:
+    """Load a sentence-transformers model once and return a batch encode function"""
+    # Optional dependency, only needed for semantic claim search
+    from sentence_transformers import SentenceTransformer
+
+    model = SentenceTransformer(model_name, device="cpu")
+
+    def encode(texts: List[str]) -> np.ndarray:
+        return model.encode(
+            texts,
+            batch_size=64,
+            convert_to_numpy=True,
+            normalize_embeddings=True,
+            show_progress_bar=False
+        )
+
+    return encode
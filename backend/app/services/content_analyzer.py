@@ -1,18 +1,23 @@
-from typing import Dict
-import requests
-from PIL import Image
+from typing import Dict, List, Optional, Tuple
+import asyncio
+import aiohttp
 import numpy as np
 import tensorflow_hub as hub
 import os
-from io import BytesIO
 from dotenv import load_dotenv
-from bs4 import BeautifulSoup
-import aiohttp
-import json
 import logging
+import time
 from pathlib import Path
-import google.generativeai as genai
 from fastapi import HTTPException
+from app.services.analysis_cache import AnalysisCache
+from app.services.http_client import get_http_client
+from app.services.gemini_client import create_gemini_client
+from app.services.micro_batcher import MicroBatcher
+from app.services.model_store import ModelStore, MOBILENET_V2_URL
+from app.services.embedding_codec import decode_embedding, encode_embedding, format_embedding
+from app.services.html_extractor import extract_images
+from app.services.image_filter import ImageDeduplicator, filter_candidates
+from app.services.image_preprocessing import RESAMPLE_FILTERS, decode_for_embedding, fill_batch
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -30,12 +35,41 @@ class ContentAnalyzer:
         google_api_key = os.getenv("GOOGLE_API_KEY")
         if not google_api_key:
             raise ValueError("GOOGLE_API_KEY environment variable is not set")
-        genai.configure(api_key=google_api_key)
-        self.model = genai.GenerativeModel('gemini-1.5-flash')
+        self.gemini = create_gemini_client(google_api_key)
+        
+        # Shared pooled HTTP client for page and image downloads
+        self.http_client = get_http_client()
+        
+        # Per-image pipeline limits for analyze_url
+        self.max_concurrent_images = int(os.getenv("CONTENT_ANALYZER_MAX_CONCURRENCY", "8"))
+        self.image_timeout = float(os.getenv("CONTENT_ANALYZER_IMAGE_TIMEOUT", "30"))
+        
+        # HTML parser backend for image extraction: auto, lxml or html.parser
+        self.html_parser = os.getenv("HTML_PARSER", "auto")
+        if self.html_parser not in ("auto", "lxml", "html.parser"):
+            raise ValueError(f"Unsupported HTML_PARSER: {self.html_parser}")
+        
+        # Pre-analysis image filtering
+        self.min_image_dimension = int(os.getenv("IMAGE_MIN_DIMENSION", "100"))
+        self.srcset_target_width = int(os.getenv("IMAGE_SRCSET_TARGET_WIDTH", "800"))
         
         # Initialize models
         self._initialize_models()
         
+        # Images in flight (from one article or concurrent requests) are
+        # grouped into a single model call of up to this many images
+        max_batch_size = int(os.getenv("IMAGE_EMBED_MAX_BATCH_SIZE", "32"))
+        self.embedding_batcher = MicroBatcher(
+            self._embed_batch,
+            max_batch_size=max_batch_size,
+            max_wait_ms=float(os.getenv("IMAGE_EMBED_MAX_WAIT_MS", "10")),
+            name="image_embedding"
+        )
+        self._batch_buffer = np.empty((max_batch_size, *self.image_input_size, 3), dtype=np.float32)
+        self.image_resample = os.getenv("IMAGE_RESAMPLE_FILTER", "bilinear")
+        if self.image_resample not in RESAMPLE_FILTERS:
+            raise ValueError(f"Unsupported IMAGE_RESAMPLE_FILTER: {self.image_resample}")
+        
         # Create cache directory if it doesn't exist
         self.cache_dir = Path("cache")
         self.cache_dir.mkdir(exist_ok=True)
@@ -45,40 +79,58 @@ class ContentAnalyzer:
 
     def _initialize_models(self):
         """Initialize all required ML models"""
+        self.image_input_size = (224, 224)  # Store expected input size
+        self.model_store = ModelStore()
+        self.startup_timings = {}
         try:
-            # Clear TensorFlow Hub cache to avoid corrupted model issues
-            import tensorflow as tf
-            tf_hub_cache_dir = os.path.expanduser("~/.cache/tfhub_modules")
-            if os.path.exists(tf_hub_cache_dir):
-                import shutil
-                try:
-                    shutil.rmtree(tf_hub_cache_dir)
-                    logger.info("Cleared TensorFlow Hub cache to resolve model loading issues")
-                except Exception as e:
-                    logger.warning(f"Could not clear TensorFlow Hub cache: {str(e)}")
-            
-            # Initialize image analysis model with explicit input size
-            self.image_model = hub.load('https://tfhub.dev/google/imagenet/mobilenet_v2_130_224/classification/4')
-            self.image_input_size = (224, 224)  # Store expected input size
-            
+            self.image_model = self._load_image_model()
             logger.info("All models initialized successfully")
         except Exception as e:
             logger.error(f"Error initializing models: {str(e)}")
             # Set a flag to indicate model loading failed
             self.image_model = None
-            self.image_input_size = (224, 224)
             logger.warning("Image analysis model failed to load. Image analysis will be limited to Gemini-based analysis only.")
 
+    def _load_image_model(self):
+        """Load MobileNet from the local model store and warm it up"""
+        start = time.perf_counter()
+        model_path = self.model_store.get("mobilenet_v2_130_224", MOBILENET_V2_URL)
+        self.startup_timings['fetch_verify_s'] = time.perf_counter() - start
+        
+        start = time.perf_counter()
+        image_model = hub.load(str(model_path))
+        self.startup_timings['load_s'] = time.perf_counter() - start
+        
+        # Run one dummy batch so graph tracing doesn't land on the first request
+        start = time.perf_counter()
+        image_model(np.zeros((1, *self.image_input_size, 3), dtype=np.float32)).numpy()
+        self.startup_timings['warmup_s'] = time.perf_counter() - start
+        
+        logger.info(
+            "Image model ready: fetch/verify %.2fs, load %.2fs, warm-up %.2fs",
+            self.startup_timings['fetch_verify_s'],
+            self.startup_timings['load_s'],
+            self.startup_timings['warmup_s']
+        )
+        return image_model
+
     def is_model_available(self) -> bool:
         """Check if the TensorFlow model is available for use"""
         return self.image_model is not None
 
+    def get_model_status(self) -> Dict:
+        """Return model availability and how long startup took"""
+        return {
+            'image_model_available': self.is_model_available(),
+            'startup_timings': self.startup_timings
+        }
+
     def retry_model_loading(self) -> bool:
         """Retry loading the TensorFlow model if it failed initially"""
         try:
             if self.image_model is None:
                 logger.info("Retrying TensorFlow model loading...")
-                self.image_model = hub.load('https://tfhub.dev/google/imagenet/mobilenet_v2_130_224/classification/4')
+                self.image_model = self._load_image_model()
                 logger.info("TensorFlow model loaded successfully on retry")
                 return True
             return True
@@ -87,58 +139,73 @@ class ContentAnalyzer:
             return False
 
     def _initialize_cache(self):
-        """Initialize the cache system"""
-        self.cache = {
-            'image_analysis': {}
-        }
-        self.cache_file = self.cache_dir / "analysis_cache.json"
-        if self.cache_file.exists():
-            try:
-                with open(self.cache_file, 'r') as f:
-                    self.cache = json.load(f)
-            except Exception as e:
-                logger.error(f"Error loading cache: {str(e)}")
+        """Initialize the persistent analysis cache"""
+        self.cache = AnalysisCache(
+            self.cache_dir / "analysis_cache.sqlite",
+            ttl_seconds=float(os.getenv("ANALYSIS_CACHE_TTL", str(7 * 24 * 3600))),
+            max_entries=int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "10000")),
+            max_bytes=int(os.getenv("ANALYSIS_CACHE_MAX_BYTES", str(512 * 1024 * 1024)))
+        )
+        
+        # One-time migration from the old whole-file JSON cache
+        legacy_cache_file = self.cache_dir / "analysis_cache.json"
+        if legacy_cache_file.exists():
+            imported = self.cache.import_json(legacy_cache_file)
+            legacy_cache_file.rename(legacy_cache_file.with_suffix(".json.migrated"))
+            logger.info(f"Migrated {imported} entries from legacy JSON cache")
 
-    def _save_cache(self):
-        """Save the current cache to disk"""
-        try:
-            with open(self.cache_file, 'w') as f:
-                json.dump(self.cache, f)
-        except Exception as e:
-            logger.error(f"Error saving cache: {str(e)}")
+    def get_cache_stats(self) -> Dict:
+        """Return hit rate, eviction counts and size of the analysis cache"""
+        return self.cache.stats()
+
+    def _preprocess_image(self, image_bytes: bytes) -> np.ndarray:
+        """Decode an image into a (224, 224, 3) uint8 array at reduced resolution"""
+        return decode_for_embedding(image_bytes, self.image_input_size, self.image_resample)
+
+    def _embed_batch(self, image_arrays: List[np.ndarray]) -> List[np.ndarray]:
+        """Run the image model once over a batch of preprocessed images"""
+        # The batcher runs one batch at a time, so the float32 buffer is reused
+        if len(image_arrays) > len(self._batch_buffer):
+            self._batch_buffer = np.empty((len(image_arrays), *self.image_input_size, 3), dtype=np.float32)
+        batch = fill_batch(image_arrays, self._batch_buffer)
+        embeddings = self.image_model(batch).numpy()
+        # Keep the (1, n) per-image shape of the original batch-of-one path
+        return [embeddings[i:i + 1] for i in range(len(image_arrays))]
 
-    async def _analyze_image(self, image_url: str, caption: str = None) -> Dict:
-        """Analyze image content and verify caption accuracy"""
+    async def _compute_embedding(self, image_bytes: bytes) -> np.ndarray:
+        """Preprocess an image and embed it as part of the next model batch"""
+        image_array = await asyncio.to_thread(self._preprocess_image, image_bytes)
+        
+        if self.image_model is None:
+            # Fallback: create a dummy embedding if model is not available
+            logger.warning("Using fallback embedding due to model unavailability")
+            return np.zeros((1, 1000))  # Dummy embedding
+        
+        return await self.embedding_batcher.submit(image_array)
+
+    @staticmethod
+    def _cache_key(image_url: str, caption: str = None) -> str:
+        return f"{image_url}:{caption}" if caption else image_url
+
+    async def _analyze_image(self, image_url: str, caption: str = None, image_bytes: bytes = None) -> Dict:
+        """
+        Analyze image content and verify caption accuracy.
+        
+        The returned dict holds the embedding as a numpy array under
+        ``'embedding'``; callers decide whether and how to serialize it.
+        """
         try:
             # Check cache first
-            cache_key = f"{image_url}:{caption}" if caption else image_url
-            if cache_key in self.cache['image_analysis']:
-                return self.cache['image_analysis'][cache_key]
-            
-            # Download and process image
-            response = requests.get(image_url)
-            image = Image.open(BytesIO(response.content))
-            
-            # Convert to RGB if needed
-            if image.mode != 'RGB':
-                image = image.convert('RGB')
-            
-            # Resize image to match model's expected input size
-            image = image.resize((224, 224), Image.Resampling.LANCZOS)
-            
-            # Convert to numpy array and normalize
-            image_array = np.array(image)
-            image_array = image_array.astype(np.float32) / 255.0
-            image_array = np.expand_dims(image_array, axis=0)
-            
-            # Get image embeddings and convert to numpy array
-            if self.image_model is not None:
-                image_embedding = self.image_model(image_array)
-                image_embedding_np = image_embedding.numpy()
-            else:
-                # Fallback: create a dummy embedding if model is not available
-                image_embedding_np = np.zeros((1, 1000))  # Dummy embedding
-                logger.warning("Using fallback embedding due to model unavailability")
+            cache_key = self._cache_key(image_url, caption)
+            cached = await asyncio.to_thread(self.cache.get_with_blob, cache_key)
+            if cached is not None:
+                results, blob = cached
+                if blob is not None:
+                    results['embedding'] = decode_embedding(blob)
+                else:
+                    # Entries migrated from the JSON cache still carry a list
+                    results['embedding'] = np.asarray(results.get('embedding', []), dtype=np.float32)
+                return results
             
             # Use Gemini for image analysis and caption verification
             prompt = f"""Analyze this image and verify if the caption accurately describes it:
@@ -153,9 +220,6 @@ Please provide:
 4. The likely context or event shown in the image
 5. A confidence score (0-1) for your analysis"""
             
-            response = self.model.generate_content(prompt)
-            analysis = response.text
-            
             # Perform reverse image search using Gemini
             reverse_search_prompt = f"""Based on the image content, identify:
 1. The likely original event or context
@@ -165,29 +229,111 @@ Please provide:
 
 Image URL: {image_url}"""
             
-            reverse_search_response = self.model.generate_content(reverse_search_prompt)
-            reverse_search_analysis = reverse_search_response.text
+            async def embed() -> np.ndarray:
+                data = image_bytes
+                if data is None:
+                    data = await self.http_client.download(image_url)
+                return await self._compute_embedding(data)
+            
+            # Embedding is batched with the page's other images while both
+            # Gemini prompts are sent concurrently; identical in-flight prompts
+            # share one request
+            image_embedding_np, analysis, reverse_search_analysis = await asyncio.gather(
+                embed(),
+                self.gemini.generate(prompt),
+                self.gemini.generate(reverse_search_prompt),
+            )
             
             results = {
-                'embedding': image_embedding_np.tolist(),
                 'caption_verification': analysis,
                 'reverse_search': reverse_search_analysis,
                 'image_url': image_url,
                 'caption': caption
             }
             
-            # Cache results
-            self.cache['image_analysis'][cache_key] = results
-            self._save_cache()
+            # Cache results, with the embedding as a compact float16 blob
+            await asyncio.to_thread(
+                self.cache.set, cache_key, results, encode_embedding(image_embedding_np)
+            )
             
+            results['embedding'] = image_embedding_np
             return results
             
         except Exception as e:
             logger.error(f"Error in _analyze_image: {str(e)}")
             raise
 
-    async def analyze_url(self, url: str) -> Dict:
-        """Analyze content from a URL"""
+    async def _select_images(self, html: str, page_url: str) -> List[Tuple[str, str]]:
+        """
+        Pick the editorial image candidates of a page from its markup.
+        
+        Relative URLs, srcset, decorative images and repeated URLs are
+        handled here so trackers and icons are never downloaded; real sizes
+        and perceptual duplicates are checked per image in ``_analyze_images``.
+        """
+        images = await asyncio.to_thread(extract_images, html, self.html_parser)
+        return filter_candidates(
+            images,
+            page_url,
+            min_dimension=self.min_image_dimension,
+            target_width=self.srcset_target_width
+        )
+
+    async def _analyze_images(self, candidates: List[Tuple[str, str]]) -> List[Dict]:
+        """
+        Download, de-duplicate and analyze many images concurrently.
+        
+        Each image moves through its own pipeline: images that are already
+        cached skip the download, the others are checked for size and
+        near-duplicates as soon as their download finishes and go straight
+        on to analysis. At most ``max_concurrent_images`` images are in
+        flight (so at most that many are held in memory), and each one's
+        download plus analysis is bounded by one ``image_timeout``.
+        Results are returned in the same order as ``candidates``; failed,
+        timed-out, small and duplicate images are skipped.
+        """
+        semaphore = asyncio.Semaphore(max(1, self.max_concurrent_images))
+        deduplicator = ImageDeduplicator(self.min_image_dimension)
+        
+        async def process(img_url: str, caption: str, stage: List[str]) -> Optional[Dict]:
+            image_bytes = None
+            if not await asyncio.to_thread(self.cache.contains, self._cache_key(img_url, caption)):
+                image_bytes = await self.http_client.download(img_url)
+                if not await asyncio.to_thread(deduplicator.admit, img_url, image_bytes):
+                    return None
+            stage[0] = "analyzing"
+            return await self._analyze_image(img_url, caption, image_bytes)
+        
+        async def analyze_one(img_url: str, caption: str) -> Optional[Dict]:
+            async with semaphore:
+                # Which step the image is in, for the log messages
+                stage = ["downloading"]
+                try:
+                    return await asyncio.wait_for(
+                        process(img_url, caption, stage),
+                        timeout=self.image_timeout
+                    )
+                except asyncio.TimeoutError:
+                    logger.warning(f"Timed out {stage[0]} image {img_url} after {self.image_timeout}s")
+                except Exception as e:
+                    logger.warning(f"Failed {stage[0]} image {img_url}: {str(e)}")
+                return None
+        
+        results = await asyncio.gather(
+            *(analyze_one(img_url, caption) for img_url, caption in candidates)
+        )
+        return [result for result in results if result is not None]
+
+    async def analyze_url(self, url: str, embeddings: str = "none") -> Dict:
+        """
+        Analyze content from a URL.
+        
+        Args:
+            url: Page to analyze
+            embeddings: How to include image embeddings in the response:
+                ``"none"`` (omit), ``"base64"`` (compact float16 blob) or
+                ``"list"`` (list of floats)
+        """
         try:
             # Initialize results
             results = {
@@ -198,37 +344,19 @@ Image URL: {image_url}"""
             }
             
             # Fetch content from URL
-            async with aiohttp.ClientSession() as session:
-                async with session.get(url) as response:
-                    if response.status != 200:
-                        raise HTTPException(status_code=response.status, detail="Failed to fetch URL")
-                    html = await response.text()
-            
-            # Parse HTML
-            soup = BeautifulSoup(html, 'html.parser')
+            try:
+                html = await self.http_client.get_text(url)
+            except aiohttp.ClientResponseError as e:
+                raise HTTPException(status_code=e.status, detail="Failed to fetch URL")
             
-            # Extract images with their captions
-            images = soup.find_all('img')
-            if images:
-                image_results = []
-                for img in images:
-                    img_url = img.get('src')
-                    if img_url:
-                        # Get caption from alt text, title, or nearby figcaption
-                        caption = img.get('alt', '')
-                        if not caption:
-                            caption = img.get('title', '')
-                        if not caption:
-                            figcaption = img.find_next('figcaption')
-                            if figcaption:
-                                caption = figcaption.get_text(strip=True)
-                        
-                        try:
-                            img_analysis = await self._analyze_image(img_url, caption)
-                            image_results.append(img_analysis)
-                        except Exception as e:
-                            logger.warning(f"Failed to analyze image {img_url}: {str(e)}")
-                
+            # Select editorial images with their captions and analyze them concurrently
+            candidates = await self._select_images(html, url)
+            if candidates:
+                image_results = await self._analyze_images(candidates)
+                for img_analysis in image_results:
+                    embedding = img_analysis.pop('embedding')
+                    if embeddings != "none":
+                        img_analysis['embedding'] = format_embedding(embedding, embeddings)
                 if image_results:
                     results['analysis']['images'] = image_results
             
@@ -0,0 +1,171 @@
+import asyncio
+import functools
+import logging
+import os
+import queue
+import sqlite3
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterator, List, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class Database:
+    """
+    Pool of persistent SQLite connections to one database file.
+
+    Connections are opened lazily, up to ``pool_size`` readers plus one
+    writer, and each is set up once with WAL journaling and the tuned
+    pragmas below, so readers never wait for the writer. Keeping the
+    connections open also keeps the sqlite3 module's per-connection
+    statement cache warm: queries with the same SQL text (parameters
+    bound with ``?``) are prepared once and reused.
+
+    Writes go through ``write()``, which serializes writers in this process
+    and takes SQLite's write lock up front (``BEGIN IMMEDIATE``). Async code
+    runs its queries with ``run()`` on a dedicated thread pool.
+    """
+
+    def __init__(
+        self,
+        db_path: Path,
+        pool_size: int = 4,
+        mmap_size: int = 256 * 1024 * 1024,
+        cache_size_kb: int = 64 * 1024,
+        busy_timeout: float = 30.0,
+        cached_statements: int = 256
+    ):
+        self.db_path = Path(db_path)
+        self.pool_size = pool_size
+        self.mmap_size = mmap_size
+        self.cache_size_kb = cache_size_kb
+        self.busy_timeout = busy_timeout
+        self.cached_statements = cached_statements
+
+        self._readers: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._opened = 0
+        self._pool_lock = threading.Lock()
+        self._writer: Optional[sqlite3.Connection] = None
+        self._write_lock = threading.Lock()
+        self.executor = ThreadPoolExecutor(max_workers=pool_size, thread_name_prefix="sqlite")
+
+    def _connect(self) -> sqlite3.Connection:
+        self.db_path.parent.mkdir(parents=True, exist_ok=True)
+        conn = sqlite3.connect(
+            self.db_path,
+            timeout=self.busy_timeout,
+            check_same_thread=False,
+            isolation_level=None,
+            cached_statements=self.cached_statements
+        )
+        conn.execute("PRAGMA journal_mode=WAL")
+        # In WAL mode NORMAL only syncs at checkpoints; a crash can lose the
+        # last transactions but never corrupts the database
+        conn.execute("PRAGMA synchronous=NORMAL")
+        conn.execute(f"PRAGMA mmap_size={int(self.mmap_size)}")
+        # Negative cache_size is in KiB rather than pages
+        conn.execute(f"PRAGMA cache_size={-int(self.cache_size_kb)}")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        return conn
+
+    @contextmanager
+    def connection(self) -> Iterator[sqlite3.Connection]:
+        """Borrow a reader connection, waiting if all of them are in use"""
+        conn = None
+        try:
+            conn = self._readers.get_nowait()
+        except queue.Empty:
+            with self._pool_lock:
+                if self._opened < self.pool_size:
+                    self._opened += 1
+                    try:
+                        conn = self._connect()
+                    except Exception:
+                        self._opened -= 1
+                        raise
+        if conn is None:
+            conn = self._readers.get()
+        try:
+            yield conn
+        finally:
+            if conn.in_transaction:
+                conn.rollback()
+            self._readers.put(conn)
+
+    @contextmanager
+    def write(self) -> Iterator[sqlite3.Connection]:
+        """
+        Run a write transaction, committed on success and rolled back on error.
+
+        Writing a whole batch in one ``write()`` block makes it a single
+        transaction; in WAL mode readers on the pool keep reading the last
+        committed state while it is written.
+        """
+        with self._write_lock:
+            if self._writer is None:
+                self._writer = self._connect()
+            conn = self._writer
+            conn.execute("BEGIN IMMEDIATE")
+            try:
+                yield conn
+            except BaseException:
+                conn.rollback()
+                raise
+            conn.commit()
+
+    def fetchall(self, sql: str, params: Any = ()) -> List[tuple]:
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchall()
+
+    def fetchone(self, sql: str, params: Any = ()) -> Optional[tuple]:
+        with self.connection() as conn:
+            return conn.execute(sql, params).fetchone()
+
+    async def run(self, func: Callable[..., T], *args, **kwargs) -> T:
+        """Call ``func(*args, **kwargs)`` on the database thread pool"""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, functools.partial(func, *args, **kwargs))
+
+    def close(self):
+        """Close every pooled connection; the pool reopens them if used again"""
+        with self._pool_lock:
+            while True:
+                try:
+                    self._readers.get_nowait().close()
+                except queue.Empty:
+                    break
+                self._opened -= 1
+        with self._write_lock:
+            if self._writer is not None:
+                self._writer.close()
+                self._writer = None
+
+
+_databases: Dict[Path, Database] = {}
+_databases_lock = threading.Lock()
+
+
+def get_database(db_path: Path) -> Database:
+    """Return the process-wide pool for ``db_path``"""
+    key = Path(db_path).resolve()
+    with _databases_lock:
+        if key not in _databases:
+            _databases[key] = Database(
+                key,
+                pool_size=int(os.getenv("SQLITE_POOL_SIZE", "4")),
+                mmap_size=int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024))),
+                cache_size_kb=int(os.getenv("SQLITE_CACHE_SIZE_KB", str(64 * 1024)))
+            )
+        return _databases[key]
+
+
+def close_databases():
+    """Close the connections of every pool"""
+    with _databases_lock:
+        for database in _databases.values():
+            database.close()
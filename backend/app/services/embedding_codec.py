@@ -0,0 +1,42 @@
+import base64
+from typing import Any, Dict
+
+import numpy as np
+
+# Embeddings are stored as little-endian float16: half the size of float32
+# and far smaller than a JSON list of Python floats
+EMBEDDING_DTYPE = np.dtype('<f2')
+
+
+def encode_embedding(embedding: np.ndarray) -> bytes:
+    """Pack an embedding into a compact float16 binary blob"""
+    return np.asarray(embedding, dtype=EMBEDDING_DTYPE).tobytes()
+
+
+def decode_embedding(blob: bytes) -> np.ndarray:
+    """Unpack a blob from ``encode_embedding`` into a (1, n) float32 array"""
+    return np.frombuffer(blob, dtype=EMBEDDING_DTYPE).astype(np.float32).reshape(1, -1)
+
+
+def format_embedding(embedding: np.ndarray, mode: str) -> Any:
+    """
+    Render an embedding for an API response.
+
+    Args:
+        embedding: The embedding array
+        mode: ``"list"`` for a nested list of floats, ``"base64"`` for a
+            base64-encoded float16 blob with its shape
+
+    Returns:
+        JSON-serializable representation of the embedding
+    """
+    if mode == "list":
+        return np.asarray(embedding).tolist()
+    if mode == "base64":
+        encoded: Dict[str, Any] = {
+            "dtype": "float16",
+            "shape": list(np.shape(embedding)),
+            "data": base64.b64encode(encode_embedding(embedding)).decode('ascii')
+        }
+        return encoded
+    raise ValueError(f"Unsupported embedding format: {mode}")
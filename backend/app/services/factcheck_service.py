@@ -1,6 +1,6 @@
 import aiohttp
 import asyncio
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List, Optional, Tuple
 import sqlite3
 from datetime import datetime
 import json
@@ -8,54 +8,268 @@ from pathlib import Path
 import os
 from bs4 import BeautifulSoup
 import re
+import logging
+import math
+import threading
+import time
+from collections import OrderedDict
+
+import numpy as np
+
+from app.services.claim_index import DEFAULT_EMBEDDING_MODEL, ClaimIndex, create_encoder
+from app.services.database import get_database
+from app.services.schema import create_fact_check_schema
+
+logger = logging.getLogger(__name__)
+
+# Words too common to help rank a claim match
+_QUERY_STOP_WORDS = frozenset("""
+a an and are as at be but by for from has have he her his i in is it its of on or that the their
+they this to was we were what when which who will with you your
+""".split())
+
+# Most query terms used in one full-text search
+MAX_QUERY_TERMS = 32
+# How long a term's document frequency is reused, and how many are kept
+TERM_FREQUENCY_TTL = 3600
+TERM_FREQUENCY_CACHE_SIZE = 50000
+# Words searched when even the rarest word of a query is too common
+COMMON_QUERY_TERMS = 3
+# Candidates fetched per wanted result when a query is re-ranked
+RERANK_FACTOR = 10
+RERANK_MIN_CANDIDATES = 50
 
 class FactCheckService:
-    def __init__(self):
-        self.db_path = Path("database/news_articles.sqlite")
-        self._init_database()
-        
-    def _init_database(self):
-        """Initialize the SQLite database with required tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Create fact checks table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS fact_checks (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                claim TEXT NOT NULL,
-                verdict TEXT NOT NULL,
-                confidence REAL NOT NULL,
-                source TEXT NOT NULL,
-                source_url TEXT NOT NULL,
-                explanation TEXT NOT NULL,
-                date TEXT NOT NULL,
-                related_claims TEXT,
-                created_at TEXT NOT NULL,
-                updated_at TEXT NOT NULL
+    def __init__(self, db_path: Optional[Path] = None):
+        self.db_path = Path(db_path) if db_path else Path("database/news_articles.sqlite")
+        # Connections are pooled per database; the schema is applied on first use
+        self.db = get_database(self.db_path)
+        self._initialized = False
+        self._init_lock = threading.Lock()
+        self.fts_enabled = False
+        # BM25 has to score every row matching any query term, so queries
+        # only use the rarest terms, up to this many matching rows in total
+        self.max_postings = int(os.getenv("FACTCHECK_FTS_MAX_POSTINGS", "5000"))
+        self._term_frequencies: "OrderedDict[str, Tuple[int, float]]" = OrderedDict()
+        self._term_lock = threading.Lock()
+        # Semantic search: the embedding model is loaded on first use and kept
+        self.claim_index = ClaimIndex(
+            Path(os.getenv("CLAIM_INDEX_DIR", "cache/claim_index")),
+            nprobe=int(os.getenv("CLAIM_INDEX_NPROBE", "16"))
+        )
+        self.embedding_model = os.getenv("CLAIM_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        self._encoder = None
+        self._encoder_lock = threading.Lock()
+    
+    def initialize(self):
+        """Create the tables and full-text index if needed; runs once, on first use"""
+        if self._initialized:
+            return
+        with self._init_lock:
+            if self._initialized:
+                return
+            with self.db.write() as conn:
+                self.fts_enabled = create_fact_check_schema(conn)
+            self._init_stemmer()
+            self._initialized = True
+    
+    def _init_stemmer(self):
+        """
+        In-memory FTS5 table with the index's tokenizer, used to turn query
+        words and candidate rows into the stemmed terms the index stores.
+        """
+        self._stemmer = sqlite3.connect(":memory:", check_same_thread=False)
+        if not self.fts_enabled:
+            return
+        self._stemmer.execute(
+            "CREATE VIRTUAL TABLE scratch USING fts5(claim, explanation, tokenize='porter unicode61')"
+        )
+        self._stemmer.execute("CREATE VIRTUAL TABLE scratch_terms USING fts5vocab(scratch, 'instance')")
+    
+    def _tokenize(self, rows: List[Tuple[str, str]], terms: Optional[List[str]] = None) -> List[Tuple[int, int, str]]:
+        """Distinct ``(row, column, term)`` triples of the given rows, optionally only for ``terms``"""
+        with self._term_lock:
+            self._stemmer.execute("DELETE FROM scratch")
+            self._stemmer.executemany(
+                "INSERT INTO scratch(rowid, claim, explanation) VALUES (?, ?, ?)",
+                [(i, claim, explanation) for i, (claim, explanation) in enumerate(rows)]
             )
-        """)
-        
-        # Create sources table
-        cursor.execute("""
-            CREATE TABLE IF NOT EXISTS sources (
-                id INTEGER PRIMARY KEY AUTOINCREMENT,
-                name TEXT NOT NULL,
-                url TEXT NOT NULL,
-                description TEXT,
-                api_available BOOLEAN NOT NULL,
-                last_updated TEXT NOT NULL
+            query = "SELECT DISTINCT doc, col, term FROM scratch_terms"
+            params: List[str] = []
+            if terms is not None:
+                query += f" WHERE term IN ({', '.join('?' * len(terms))})"
+                params = terms
+            return self._stemmer.execute(query, params).fetchall()
+    
+    def _stem_words(self, words: List[str]) -> List[List[str]]:
+        """Index terms for each word, in order"""
+        stems: List[List[str]] = [[] for _ in words]
+        for row, _, term in self._tokenize([(word, "") for word in words]):
+            stems[row].append(term)
+        return stems
+    
+    def _document_frequencies(self, conn: sqlite3.Connection, terms: List[str]) -> Tuple[Dict[str, int], int]:
+        """
+        Number of fact checks containing each index term, and in total.
+        
+        fts5vocab counts these by walking the term's doclist, so counts are
+        cached for an hour; they only need to be roughly right. Terms not
+        in the index yet are not cached, since a word with no documents is
+        left out of the query and would hide newly added fact checks.
+        """
+        now = time.time()
+        frequencies: Dict[str, int] = {}
+        missing = []
+        with self._term_lock:
+            # The empty string is never an index term; it holds the row count
+            for term in [""] + terms:
+                entry = self._term_frequencies.get(term)
+                if entry is not None and now - entry[1] < TERM_FREQUENCY_TTL:
+                    frequencies[term] = entry[0]
+                    self._term_frequencies.move_to_end(term)
+                else:
+                    missing.append(term)
+        
+        if missing:
+            found = {}
+            if "" in missing:
+                found[""] = conn.execute("SELECT COUNT(*) FROM fact_checks").fetchone()[0]
+            lookup = [term for term in missing if term]
+            if lookup:
+                placeholders = ", ".join("?" * len(lookup))
+                found.update(conn.execute(
+                    f"SELECT term, doc FROM fact_checks_vocab WHERE term IN ({placeholders})",
+                    lookup
+                ).fetchall())
+            with self._term_lock:
+                for term in missing:
+                    frequencies[term] = found.get(term, 0)
+                    if term and not frequencies[term]:
+                        continue
+                    self._term_frequencies[term] = (frequencies[term], now)
+                    self._term_frequencies.move_to_end(term)
+                while len(self._term_frequencies) > TERM_FREQUENCY_CACHE_SIZE:
+                    self._term_frequencies.popitem(last=False)
+        
+        total = frequencies.pop("")
+        return frequencies, total
+    
+    @staticmethod
+    def _query_terms(text: str) -> List[str]:
+        """Distinct words of a query, without stop words unless that leaves none"""
+        words = re.findall(r"[^\W_]+", text.lower())
+        terms = [word for word in words if word not in _QUERY_STOP_WORDS] or words
+        return list(dict.fromkeys(terms))[:MAX_QUERY_TERMS]
+    
+    def _build_match_query(self, conn: sqlite3.Connection, text: str) -> Tuple[str, Dict[str, float], bool]:
+        """
+        Turn free text into an FTS5 query for BM25 ranking.
+        
+        Distinct words are quoted (so FTS syntax in the input is inert) and
+        OR-ed together, rarest first, while the rows they match stay within
+        ``max_postings``; the rare words carry most of the BM25 score. If
+        even the rarest word is that common, the ``COMMON_QUERY_TERMS``
+        rarest words are searched and the result limit bounds the work.
+        
+        Returns the query, the IDF of every query term found in the index
+        (for re-ranking) and whether the query leaves any words out.
+        """
+        terms = self._query_terms(text)
+        if not terms:
+            return "", {}, False
+        
+        stems = self._stem_words(terms)
+        frequencies, total = self._document_frequencies(conn, sorted({t for group in stems for t in group}))
+        ranked = sorted(
+            (min(frequencies[t] for t in group), word)
+            for word, group in zip(terms, stems)
+            if group and all(frequencies[t] for t in group)
+        )
+        if not ranked:
+            return "", {}, False
+        
+        weights = {
+            term: math.log((1 + total) / (1 + frequency))
+            for term, frequency in frequencies.items() if frequency
+        }
+        
+        chosen = []
+        postings = 0
+        for frequency, word in ranked:
+            if chosen and postings + frequency > self.max_postings:
+                break
+            chosen.append(f'"{word}"')
+            postings += frequency
+        if postings > self.max_postings:
+            chosen = [f'"{word}"' for _, word in ranked[:COMMON_QUERY_TERMS]]
+        return " OR ".join(chosen), weights, len(chosen) < len(ranked)
+    
+    def _rerank(self, rows: List[tuple], weights: Dict[str, float], max_results: int) -> List[tuple]:
+        """
+        Re-rank candidate rows by the IDF of all query terms they contain,
+        claim matches counting double, keeping the BM25 order for ties.
+        """
+        scores = [0.0] * len(rows)
+        tokens = self._tokenize([(row[1], row[6]) for row in rows], sorted(weights))
+        for row, column, term in tokens:
+            scores[row] += weights[term] * (2.0 if column == 0 else 1.0)
+        order = sorted(range(len(rows)), key=lambda i: -scores[i])
+        return [rows[i] for i in order[:max_results]]
+    
+    def _encode(self, texts: List[str]) -> np.ndarray:
+        """Embed texts with the claim embedding model, loading it once"""
+        if self._encoder is None:
+            with self._encoder_lock:
+                if self._encoder is None:
+                    start = time.perf_counter()
+                    self._encoder = create_encoder(self.embedding_model)
+                    logger.info(
+                        f"Loaded claim embedding model {self.embedding_model} "
+                        f"in {time.perf_counter() - start:.1f}s"
+                    )
+        return self._encoder(texts)
+    
+    def _semantic_search(self, texts: List[str], source_url: Optional[str], max_results: int) -> List[List[tuple]]:
+        """Rows of the fact checks whose claims are closest to each text in embedding space"""
+        self.initialize()
+        if not self.claim_index.available:
+            raise RuntimeError(
+                f"Claim index not found in {self.claim_index.directory}; "
+                "build it with `python scripts/build_claim_index.py`"
             )
-        """)
+        if self.claim_index.meta.get("model") != self.embedding_model:
+            raise RuntimeError(
+                f"Claim index was built with {self.claim_index.meta.get('model')}, "
+                f"not {self.embedding_model}"
+            )
+        
+        # The source filter is applied afterwards, so look further down the list
+        k = max(max_results * RERANK_FACTOR, RERANK_MIN_CANDIDATES) if source_url else max_results
+        # One model call for all texts, then one row lookup for all hits
+        hits = [
+            [int(i) for i in self.claim_index.search(vector, k)[0]]
+            for vector in self._encode(texts)
+        ]
+        ids = sorted({i for group in hits for i in group})
+        if not ids:
+            return [[] for _ in texts]
+        
+        query = f"SELECT * FROM fact_checks WHERE id IN ({', '.join('?' * len(ids))})"
+        params: List[Any] = list(ids)
+        if source_url:
+            query += " AND source_url = ?"
+            params.append(source_url)
         
-        conn.commit()
-        conn.close()
+        rows = {row[0]: row for row in self.db.fetchall(query, params)}
+        # Keep similarity order; ids deleted since the index was built drop out
+        return [[rows[i] for i in group if i in rows][:max_results] for group in hits]
     
     async def search_claims(
         self,
         text: str,
         source_url: Optional[str] = None,
-        max_results: int = 5
+        max_results: int = 5,
+        mode: str = "lexical"
     ) -> List[Dict[str, Any]]:
         """
         Search for fact checks related to the given text.
@@ -64,91 +278,156 @@ class FactCheckService:
             text: The text to search for
             source_url: Optional URL to filter results by source
             max_results: Maximum number of results to return
+            mode: "lexical" for keyword search, "semantic" for nearest
+                claims by embedding similarity
             
         Returns:
             List of fact check results
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Prepare search query
-        query = """
-            SELECT * FROM fact_checks
-            WHERE claim LIKE ?
-            OR explanation LIKE ?
+        results = await self.search_claims_many([text], source_url, max_results, mode)
+        return results[0]
+    
+    async def search_claims_many(
+        self,
+        texts: List[str],
+        source_url: Optional[str] = None,
+        max_results: int = 5,
+        mode: str = "lexical"
+    ) -> List[List[Dict[str, Any]]]:
         """
-        params = [f"%{text}%", f"%{text}%"]
+        Search fact checks for several claims at once.
         
-        if source_url:
-            query += " AND source_url = ?"
-            params.append(source_url)
+        All lookups share one trip to the database threads: lexical mode
+        runs every query on one connection after fetching the document
+        frequencies of all their terms together, semantic mode embeds the
+        texts in one batch and reads all matched rows in one query.
         
-        query += " ORDER BY confidence DESC LIMIT ?"
-        params.append(max_results)
+        Returns:
+            One list of fact check results per text, in order
+        """
+        if not texts:
+            return []
+        if mode == "semantic":
+            # Embedding the queries is CPU work, so it stays off the database threads
+            results = await asyncio.to_thread(self._semantic_search, texts, source_url, max_results)
+        elif mode == "lexical":
+            results = await self.db.run(self._lexical_search, texts, source_url, max_results)
+        else:
+            raise ValueError(f"Unknown search mode: {mode}")
+        return [[self._to_dict(row) for row in rows] for rows in results]
+    
+    def _lexical_search(self, texts: List[str], source_url: Optional[str], max_results: int) -> List[List[tuple]]:
+        """Rows of the fact checks matching the words of each text, best first"""
+        self.initialize()
+        with self.db.connection() as conn:
+            if self.fts_enabled and len(texts) > 1:
+                # Look up the frequencies of every query's terms together;
+                # the per-query lookups below then hit the cache
+                words = sorted({word for text in texts for word in self._query_terms(text)})
+                stems = self._stem_words(words)
+                self._document_frequencies(conn, sorted({t for group in stems for t in group}))
+            return [self._lexical_rows(conn, text, source_url, max_results) for text in texts]
+    
+    def _lexical_rows(
+        self,
+        conn: sqlite3.Connection,
+        text: str,
+        source_url: Optional[str],
+        max_results: int
+    ) -> List[tuple]:
+        """Rows of the fact checks matching the words of ``text``, best first"""
+        # Prepare search query
+        rerank_weights = None
+        if self.fts_enabled:
+            match_query, weights, partial = self._build_match_query(conn, text)
+            if not match_query:
+                return []
+            # When common words were left out of the query, fetch extra
+            # candidates and re-rank them using every word
+            limit = max_results
+            if partial:
+                rerank_weights = weights
+                limit = max(max_results * RERANK_FACTOR, RERANK_MIN_CANDIDATES)
+            
+            # Rank inside the index and only join the top rows back;
+            # claim matches weigh twice as much as explanation matches
+            source_filter = " AND rowid IN (SELECT id FROM fact_checks WHERE source_url = ?)" if source_url else ""
+            query = f"""
+                SELECT fact_checks.* FROM (
+                    SELECT rowid, bm25(fact_checks_fts, 2.0, 1.0) AS score FROM fact_checks_fts
+                    WHERE fact_checks_fts MATCH ?{source_filter}
+                    ORDER BY score LIMIT ?
+                ) AS matches
+                JOIN fact_checks ON fact_checks.id = matches.rowid
+                ORDER BY matches.score
+            """
+            params = [match_query] + ([source_url] if source_url else []) + [limit]
+        else:
+            query = """
+                SELECT * FROM fact_checks
+                WHERE (claim LIKE ? OR explanation LIKE ?)
+            """
+            params = [f"%{text}%", f"%{text}%"]
+            
+            if source_url:
+                query += " AND source_url = ?"
+                params.append(source_url)
+            
+            query += " ORDER BY confidence DESC LIMIT ?"
+            params.append(max_results)
         
         # Execute query
-        cursor.execute(query, params)
-        results = cursor.fetchall()
-        
-        # Convert results to dictionaries
-        fact_checks = []
-        for row in results:
-            fact_checks.append({
-                "claim": row[1],
-                "verdict": row[2],
-                "confidence": row[3],
-                "source": row[4],
-                "source_url": row[5],
-                "explanation": row[6],
-                "date": row[7],
-                "related_claims": json.loads(row[8]) if row[8] else []
-            })
-        
-        conn.close()
-        return fact_checks
+        results = conn.execute(query, params).fetchall()
+        
+        if rerank_weights:
+            results = self._rerank(results, rerank_weights, max_results)
+        return results
+    
+    @staticmethod
+    def _to_dict(row: tuple) -> Dict[str, Any]:
+        """Convert a fact_checks row to a result dictionary"""
+        return {
+            "claim": row[1],
+            "verdict": row[2],
+            "confidence": row[3],
+            "source": row[4],
+            "source_url": row[5],
+            "explanation": row[6],
+            "date": row[7],
+            "related_claims": json.loads(row[8]) if row[8] else []
+        }
     
     async def get_database_stats(self) -> Dict[str, Any]:
         """
         Get statistics about the fact-checking database.
         """
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
-        
-        # Get total number of fact checks
-        cursor.execute("SELECT COUNT(*) FROM fact_checks")
-        total_checks = cursor.fetchone()[0]
-        
-        # Get number of fact checks by source
-        cursor.execute("""
-            SELECT source, COUNT(*) as count
-            FROM fact_checks
-            GROUP BY source
-        """)
-        checks_by_source = dict(cursor.fetchall())
-        
-        # Get number of fact checks by verdict
-        cursor.execute("""
-            SELECT verdict, COUNT(*) as count
-            FROM fact_checks
-            GROUP BY verdict
-        """)
-        checks_by_verdict = dict(cursor.fetchall())
-        
-        # Get average confidence by source
-        cursor.execute("""
-            SELECT source, AVG(confidence) as avg_confidence
-            FROM fact_checks
-            GROUP BY source
-        """)
-        confidence_by_source = dict(cursor.fetchall())
-        
-        conn.close()
+        return await self.db.run(self._database_stats)
+    
+    def _database_stats(self) -> Dict[str, Any]:
+        self.initialize()
+        with self.db.connection() as conn:
+            # Get total number of fact checks
+            total_checks = conn.execute("SELECT COUNT(*) FROM fact_checks").fetchone()[0]
+            
+            # Get number of fact checks and average confidence by source
+            by_source = conn.execute("""
+                SELECT source, COUNT(*) as count, AVG(confidence) as avg_confidence
+                FROM fact_checks
+                GROUP BY source
+            """).fetchall()
+            
+            # Get number of fact checks by verdict
+            checks_by_verdict = dict(conn.execute("""
+                SELECT verdict, COUNT(*) as count
+                FROM fact_checks
+                GROUP BY verdict
+            """).fetchall())
         
         return {
             "total_fact_checks": total_checks,
-            "checks_by_source": checks_by_source,
+            "checks_by_source": {source: count for source, count, _ in by_source},
             "checks_by_verdict": checks_by_verdict,
-            "confidence_by_source": confidence_by_source,
+            "confidence_by_source": {source: confidence for source, _, confidence in by_source},
             "last_updated": datetime.now().isoformat()
         }
     
@@ -0,0 +1,122 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+from typing import Dict, Optional
+
+import aiohttp
+
+from app.services.http_client import HTTPClient, get_http_client
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_GEMINI_BASE_URL = "https://generativelanguage.googleapis.com"
+# Longest part of a non-JSON error body kept in the exception message
+ERROR_BODY_CHARS = 200
+
+
+class GeminiClient:
+    """
+    Async client for the Gemini ``generateContent`` REST endpoint.
+
+    Requests go through the shared pooled HTTP client, so several prompts can
+    be in flight at once without blocking the event loop. Identical prompts
+    that are already in flight are coalesced: the request runs as its own
+    task and every caller awaits it through ``asyncio.shield``, so one caller
+    being cancelled does not affect the others. ``base_url`` can point at
+    a local fake server for testing.
+    """
+
+    def __init__(
+        self,
+        api_key: str,
+        model_name: str = "gemini-1.5-flash",
+        base_url: Optional[str] = None,
+        http_client: Optional[HTTPClient] = None,
+        max_concurrent_requests: int = 16,
+        timeout: float = 60.0
+    ):
+        self.api_key = api_key
+        self.model_name = model_name
+        self.base_url = (base_url or DEFAULT_GEMINI_BASE_URL).rstrip("/")
+        self.http_client = http_client or get_http_client()
+        self.timeout = aiohttp.ClientTimeout(total=timeout)
+
+        self.max_concurrent_requests = max_concurrent_requests
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {"requests": 0, "coalesced": 0}
+
+    @property
+    def endpoint(self) -> str:
+        return f"{self.base_url}/v1beta/models/{self.model_name}:generateContent"
+
+    async def generate(self, prompt: str) -> str:
+        """
+        Generate a text response for ``prompt``.
+
+        Concurrent calls with the same prompt share one API request.
+        """
+        key = hashlib.sha256(f"{self.model_name}\0{prompt}".encode()).hexdigest()
+
+        task = self._inflight.get(key)
+        if task is not None:
+            self.stats["coalesced"] += 1
+        else:
+            # The request runs as its own task, so cancelling one caller (for
+            # example by a per-image timeout) does not cancel the others
+            task = asyncio.ensure_future(self._request(prompt))
+            self._inflight[key] = task
+            task.add_done_callback(lambda done: self._request_done(key, done))
+        return await asyncio.shield(task)
+
+    def _request_done(self, key: str, task: asyncio.Future):
+        if self._inflight.get(key) is task:
+            del self._inflight[key]
+        # Mark the exception as retrieved when every caller has gone away
+        if not task.cancelled():
+            task.exception()
+
+    async def _request(self, prompt: str) -> str:
+        """Send a single generateContent request and return the response text"""
+        payload = {"contents": [{"parts": [{"text": prompt}]}]}
+
+        # Created lazily so it binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+
+        async with self._semaphore:
+            self.stats["requests"] += 1
+            async with self.http_client.session.post(
+                self.endpoint,
+                params={"key": self.api_key},
+                json=payload,
+                timeout=self.timeout
+            ) as response:
+                if response.status != 200:
+                    # Error bodies may be HTML from a proxy rather than JSON
+                    body = await response.text(errors="replace")
+                    try:
+                        message = json.loads(body)["error"]["message"]
+                    except (ValueError, KeyError, TypeError):
+                        message = body[:ERROR_BODY_CHARS]
+                    raise RuntimeError(f"Gemini API request failed with status {response.status}: {message}")
+                data = await response.json(content_type=None)
+
+        try:
+            parts = data["candidates"][0]["content"]["parts"]
+        except (KeyError, IndexError, TypeError):
+            raise RuntimeError(f"Unexpected Gemini API response: {data}")
+        return "".join(part.get("text", "") for part in parts)
+
+
+def create_gemini_client(api_key: str) -> GeminiClient:
+    """Build a GeminiClient configured from environment variables"""
+    return GeminiClient(
+        api_key=api_key,
+        model_name=os.getenv("GEMINI_MODEL", "gemini-1.5-flash"),
+        base_url=os.getenv("GEMINI_API_BASE_URL"),
+        max_concurrent_requests=int(os.getenv("GEMINI_MAX_CONCURRENCY", "16")),
+        timeout=float(os.getenv("GEMINI_TIMEOUT", "60"))
+    )
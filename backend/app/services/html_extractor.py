@@ -0,0 +1,109 @@
+import logging
+from html.parser import HTMLParser
+from typing import Dict, List, Optional, Tuple, Union
+
+logger = logging.getLogger(__name__)
+
+try:
+    import lxml.html
+    LXML_AVAILABLE = True
+except ImportError:
+    LXML_AVAILABLE = False
+
+# Document-order events: ("img", attributes) or ("figcaption", text)
+Event = Tuple[str, Union[Dict[str, str], str]]
+
+
+class _ImageEventParser(HTMLParser):
+    """Streaming html.parser pass that records <img> tags and <figcaption> text"""
+
+    def __init__(self):
+        super().__init__()
+        self.events: List[Event] = []
+        self._caption_depth = 0
+        self._caption_parts: List[str] = []
+
+    def handle_starttag(self, tag, attrs):
+        if tag == "img":
+            self.events.append(("img", {name: value or "" for name, value in attrs}))
+        elif tag == "figcaption":
+            if self._caption_depth == 0:
+                self._caption_parts = []
+            self._caption_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag == "figcaption" and self._caption_depth > 0:
+            self._caption_depth -= 1
+            if self._caption_depth == 0:
+                self.events.append(("figcaption", "".join(self._caption_parts)))
+
+    def handle_data(self, data):
+        if self._caption_depth > 0:
+            stripped = data.strip()
+            if stripped:
+                self._caption_parts.append(stripped)
+
+
+def _events_html_parser(html: str) -> List[Event]:
+    parser = _ImageEventParser()
+    parser.feed(html)
+    parser.close()
+    return parser.events
+
+
+def _events_lxml(html: str) -> List[Event]:
+    document = lxml.html.document_fromstring(html)
+    events: List[Event] = []
+    for element in document.iter("img", "figcaption"):
+        if element.tag == "img":
+            events.append(("img", dict(element.attrib)))
+        else:
+            text = "".join(part.strip() for part in element.itertext())
+            events.append(("figcaption", text))
+    return events
+
+
+def extract_images(html: str, parser: str = "auto") -> List[Tuple[Dict[str, str], str]]:
+    """
+    Extract ``(img attributes, caption)`` pairs from a page in one pass.
+
+    The caption is the image's alt text, else its title, else the text of
+    the first ``<figcaption>`` after it in the document. Tags are collected
+    in a single traversal and captions are assigned by one backwards sweep,
+    so the cost is linear in the page size.
+
+    Args:
+        html: Page markup
+        parser: ``"lxml"``, ``"html.parser"`` or ``"auto"`` (lxml when installed)
+
+    Returns:
+        Pairs in page order
+    """
+    if not html or not html.strip():
+        return []
+
+    events: Optional[List[Event]] = None
+    if parser in ("auto", "lxml") and LXML_AVAILABLE:
+        try:
+            events = _events_lxml(html)
+        except (ValueError, lxml.etree.ParserError) as e:
+            logger.warning(f"lxml could not parse page, falling back to html.parser: {str(e)}")
+    elif parser == "lxml":
+        raise ValueError("lxml parser requested but lxml is not installed")
+    elif parser not in ("auto", "html.parser"):
+        raise ValueError(f"Unsupported HTML parser: {parser}")
+
+    if events is None:
+        events = _events_html_parser(html)
+
+    images: List[Tuple[Dict[str, str], str]] = []
+    next_figcaption = ""
+    for kind, value in reversed(events):
+        if kind == "figcaption":
+            next_figcaption = value
+            continue
+        caption = value.get("alt") or value.get("title") or next_figcaption
+        images.append((value, caption))
+
+    images.reverse()
+    return images
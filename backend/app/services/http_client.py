@@ -0,0 +1,181 @@
+import asyncio
+import logging
+import os
+from typing import Dict, NamedTuple, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class FetchResult(NamedTuple):
+    """Outcome of a conditional GET; ``text`` is None when the resource was not modified"""
+    status: int
+    text: Optional[str]
+    etag: Optional[str]
+    last_modified: Optional[str]
+
+
+class HTTPClient:
+    """
+    Shared, pooled async HTTP client.
+
+    Wraps a single ``aiohttp.ClientSession`` with keep-alive, a global and a
+    per-host connection limit and default timeouts. The session is created
+    lazily on first use so it binds to the running event loop; when a
+    different loop asks for it, the previous loop's session is closed.
+    """
+
+    def __init__(
+        self,
+        limit: int = 100,
+        limit_per_host: int = 10,
+        total_timeout: float = 30.0,
+        connect_timeout: float = 10.0,
+        keepalive_timeout: float = 30.0,
+        max_download_bytes: int = 20 * 1024 * 1024
+    ):
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.timeout = aiohttp.ClientTimeout(total=total_timeout, connect=connect_timeout)
+        self.keepalive_timeout = keepalive_timeout
+        self.max_download_bytes = max_download_bytes
+        self.headers = {"User-Agent": "NewsCredible/1.0 (+https://www.newscredible.tech)"}
+
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+
+    @property
+    def session(self) -> aiohttp.ClientSession:
+        """Return the pooled session, creating it for the current loop if needed"""
+        loop = asyncio.get_running_loop()
+        if self._session is None or self._session.closed or self._loop is not loop:
+            self._release_session()
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=self.timeout,
+                headers=self.headers
+            )
+            self._loop = loop
+        return self._session
+
+    def _release_session(self):
+        """Close the session of the previous event loop, or detach it if that loop has stopped"""
+        session, loop = self._session, self._loop
+        self._session = None
+        self._loop = None
+        if session is None or session.closed:
+            return
+        if loop is not None and loop.is_running():
+            # The old loop still runs in another thread; close the session there
+            asyncio.run_coroutine_threadsafe(session.close(), loop)
+        else:
+            # Its loop can no longer run the close; drop the connector so its
+            # connections are released when it is garbage collected
+            session.detach()
+
+    async def get_text(self, url: str, max_bytes: Optional[int] = None, **kwargs) -> str:
+        """
+        GET ``url`` and return the decoded body, raising on non-200 responses.
+
+        Like ``download()``, the body is capped at ``max_bytes`` (defaults to
+        ``max_download_bytes``). It is decoded with the response charset,
+        falling back to UTF-8.
+        """
+        result = await self.fetch_text(url, max_bytes=max_bytes, **kwargs)
+        if result.text is None:
+            raise ValueError(f"Unexpected HTTP {result.status} for {url}")
+        return result.text
+
+    async def fetch_text(
+        self,
+        url: str,
+        headers: Optional[Dict[str, str]] = None,
+        max_bytes: Optional[int] = None,
+        **kwargs
+    ) -> FetchResult:
+        """
+        Conditional GET of a text resource.
+
+        ``headers`` may carry ``If-None-Match``/``If-Modified-Since``; a 304
+        comes back with no text, a 200 with the body read and decoded as in
+        ``get_text()``, and any other status raises. The response's ETag and
+        Last-Modified are returned for the next request.
+        """
+        async with self.session.get(url, headers=headers, **kwargs) as response:
+            if response.status == 304:
+                return FetchResult(304, None, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+            body = await self._read_body(response, url, max_bytes or self.max_download_bytes)
+            encoding = response.charset or "utf-8"
+            etag = response.headers.get("ETag")
+            last_modified = response.headers.get("Last-Modified")
+        try:
+            text = body.decode(encoding, errors="replace")
+        except LookupError:
+            text = body.decode("utf-8", errors="replace")
+        return FetchResult(response.status, text, etag, last_modified)
+
+    async def download(self, url: str, max_bytes: Optional[int] = None, **kwargs) -> bytes:
+        """
+        Stream ``url`` into memory, aborting once more than ``max_bytes`` arrive.
+
+        Args:
+            url: Resource to download
+            max_bytes: Size cap, defaults to ``max_download_bytes``
+
+        Returns:
+            The response body
+        """
+        async with self.session.get(url, **kwargs) as response:
+            return await self._read_body(response, url, max_bytes or self.max_download_bytes)
+
+    @staticmethod
+    async def _read_body(response: aiohttp.ClientResponse, url: str, max_bytes: int) -> bytes:
+        """Read a 200 response in chunks, raising once it grows past ``max_bytes``"""
+        if response.status != 200:
+            raise aiohttp.ClientResponseError(
+                response.request_info,
+                response.history,
+                status=response.status,
+                message=f"HTTP {response.status}"
+            )
+
+        if response.content_length and response.content_length > max_bytes:
+            raise ValueError(
+                f"Refusing to download {url}: {response.content_length} bytes exceeds limit of {max_bytes}"
+            )
+
+        chunks = []
+        received = 0
+        async for chunk in response.content.iter_chunked(64 * 1024):
+            received += len(chunk)
+            if received > max_bytes:
+                raise ValueError(f"Download of {url} exceeded limit of {max_bytes} bytes")
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    async def close(self):
+        """Close the pooled session and its connections"""
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+        self._loop = None
+
+
+def get_http_client() -> HTTPClient:
+    """Return the process-wide HTTP client"""
+    if not hasattr(get_http_client, "instance"):
+        get_http_client.instance = HTTPClient(
+            limit=int(os.getenv("HTTP_POOL_LIMIT", "100")),
+            limit_per_host=int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "10")),
+            total_timeout=float(os.getenv("HTTP_TIMEOUT", "30")),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "10")),
+            max_download_bytes=int(os.getenv("HTTP_MAX_DOWNLOAD_BYTES", str(20 * 1024 * 1024)))
+        )
+    return get_http_client.instance
@@ -0,0 +1,247 @@
+import logging
+import re
+import threading
+from io import BytesIO
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urljoin, urlparse
+
+import imagehash
+from PIL import Image
+
+logger = logging.getLogger(__name__)
+
+# Path words that almost always mean non-editorial images. "pixel" only
+# counts as a whole file name (/pixel.gif) so stories about Pixel phones
+# are kept; 1x1 sizes mark tracking pixels.
+DECORATIVE_URL_PATTERN = re.compile(
+    r"(^|[/_.\-])(spacer|blank|tracking|beacon|logo|icon|sprite|avatar|badge|emoji|favicon|placeholder)s?([/_.\-]|$)"
+    r"|/(tracking[_\-]?)?pixels?\.\w+$"
+    r"|(^|[/_.\-])1x1([/_.\-]|$)",
+    re.IGNORECASE
+)
+DECORATIVE_EXTENSIONS = (".svg", ".ico")
+
+# A width/height attribute given in pixels: "300" or "300px"
+_PIXEL_SIZE = re.compile(r"\s*(\d+)\s*(px)?\s*$", re.IGNORECASE)
+
+# Attributes that lazy-loading scripts use instead of src
+LAZY_SRC_ATTRIBUTES = ("data-src", "data-lazy-src", "data-original")
+
+
+def _srcset_width(descriptors: List[str]) -> Optional[float]:
+    """Width of one srcset candidate from its descriptors, or None if they are invalid"""
+    # A height descriptor only qualifies a width one
+    descriptors = [d for d in descriptors if not d.lower().endswith("h")]
+    if not descriptors:
+        return -1.0
+    if len(descriptors) > 1:
+        return None
+    descriptor = descriptors[0].lower()
+    try:
+        if descriptor.endswith("w") and descriptor[:-1].isdigit() and int(descriptor[:-1]) > 0:
+            return float(descriptor[:-1])
+        if descriptor.endswith("x") and float(descriptor[:-1]) > 0:
+            return -1.0 / float(descriptor[:-1])
+    except ValueError:
+        pass
+    return None
+
+
+def parse_srcset(srcset: str) -> List[Tuple[str, float]]:
+    """
+    Parse a ``srcset`` attribute into ``(url, width)`` pairs.
+
+    Follows the HTML parsing rules: a URL runs up to whitespace, so commas
+    inside it (``/w_400,c_fill/photo.jpg``) are kept, and a comma only
+    separates candidates after the URL's descriptors. Pixel-density
+    descriptors (``2x``, or none for ``1x``) are returned as negative
+    widths so they sort below explicit widths but keep their relative
+    order. Candidates with invalid descriptors are dropped.
+    """
+    candidates = []
+    position, length = 0, len(srcset)
+    while position < length:
+        while position < length and (srcset[position].isspace() or srcset[position] == ","):
+            position += 1
+        start = position
+        while position < length and not srcset[position].isspace():
+            position += 1
+        url = srcset[start:position]
+        if not url:
+            break
+
+        descriptors: List[str] = []
+        if url.endswith(","):
+            # "a.jpg, b.jpg": the comma ends the candidate, no descriptors
+            url = url.rstrip(",")
+        else:
+            # Descriptors run to the next comma outside parentheses
+            start = position
+            depth = 0
+            while position < length:
+                char = srcset[position]
+                if char == "(":
+                    depth += 1
+                elif char == ")" and depth:
+                    depth -= 1
+                elif char == "," and not depth:
+                    break
+                position += 1
+            descriptors = srcset[start:position].split()
+            position += 1
+
+        width = _srcset_width(descriptors)
+        if url and width is not None:
+            candidates.append((url, width))
+    return candidates
+
+
+def pick_srcset_candidate(srcset: str, target_width: int) -> Optional[str]:
+    """
+    Pick one URL from ``srcset``: the smallest candidate at least
+    ``target_width`` wide, or the widest one if none is large enough.
+    """
+    candidates = parse_srcset(srcset)
+    if not candidates:
+        return None
+
+    wide_enough = [c for c in candidates if c[1] >= target_width]
+    if wide_enough:
+        return min(wide_enough, key=lambda c: c[1])[0]
+    return max(candidates, key=lambda c: c[1])[0]
+
+
+def _int_attribute(value: Optional[str]) -> Optional[int]:
+    """Pixel size of a width/height attribute; percentages, ems, "auto" and the like are unknown"""
+    if not value:
+        return None
+    match = _PIXEL_SIZE.match(str(value))
+    return int(match.group(1)) if match else None
+
+
+def resolve_image_url(attrs: Dict[str, str], page_url: str, target_width: int) -> Optional[str]:
+    """Return one absolute http(s) URL for an ``<img>`` or None if it has no usable source"""
+    src = None
+    srcset = attrs.get("srcset") or attrs.get("data-srcset")
+    if srcset:
+        src = pick_srcset_candidate(srcset, target_width)
+    if not src:
+        src = attrs.get("src")
+    if not src or src.startswith("data:"):
+        for attribute in LAZY_SRC_ATTRIBUTES:
+            if attrs.get(attribute):
+                src = attrs[attribute]
+                break
+    if not src or src.startswith("data:"):
+        return None
+
+    url = urljoin(page_url, src.strip())
+    if urlparse(url).scheme not in ("http", "https"):
+        return None
+    return url
+
+
+def is_decorative(attrs: Dict[str, str], url: str, min_dimension: int) -> bool:
+    """Judge from markup alone whether an image is a pixel, icon, logo or similar"""
+    if attrs.get("role") == "presentation" or attrs.get("aria-hidden") == "true":
+        return True
+
+    width = _int_attribute(attrs.get("width"))
+    height = _int_attribute(attrs.get("height"))
+    if (width is not None and width < min_dimension) or (height is not None and height < min_dimension):
+        return True
+
+    path = urlparse(url).path
+    if path.lower().endswith(DECORATIVE_EXTENSIONS):
+        return True
+    return bool(DECORATIVE_URL_PATTERN.search(path))
+
+
+def sniff_image(image_bytes: bytes) -> Tuple[int, int, imagehash.ImageHash]:
+    """
+    Read an image's dimensions from its header and compute a perceptual hash.
+
+    Only the header is parsed for the size; the hash is computed from a
+    reduced-resolution decode.
+    """
+    image = Image.open(BytesIO(image_bytes))
+    width, height = image.size
+    image.draft('L', (64, 64))
+    return width, height, imagehash.phash(image)
+
+
+def filter_candidates(
+    images: List[Tuple[Dict[str, str], str]],
+    page_url: str,
+    min_dimension: int = 100,
+    target_width: int = 800
+) -> List[Tuple[str, str]]:
+    """
+    Markup-only filtering stage for ``<img>`` tags, run before any download.
+
+    Resolves relative URLs, picks one ``srcset`` candidate, drops decorative
+    images and removes repeated URLs, keeping page order.
+
+    Args:
+        images: ``(attributes, caption)`` for each ``<img>`` in page order
+        page_url: URL of the page the images came from
+        min_dimension: Smallest width/height attribute kept
+        target_width: Preferred ``srcset`` width
+
+    Returns:
+        ``(image_url, caption)`` pairs
+    """
+    selected: List[Tuple[str, str]] = []
+    index_by_url: Dict[str, int] = {}
+
+    for attrs, caption in images:
+        url = resolve_image_url(attrs, page_url, target_width)
+        if url is None or is_decorative(attrs, url, min_dimension):
+            continue
+
+        if url in index_by_url:
+            # Same image repeated: keep the first, but fill in a missing caption
+            position = index_by_url[url]
+            if not selected[position][1] and caption:
+                selected[position] = (url, caption)
+            continue
+
+        index_by_url[url] = len(selected)
+        selected.append((url, caption))
+
+    return selected
+
+
+class ImageDeduplicator:
+    """
+    Content-based filtering stage, applied to each image as its download
+    finishes so analysis can start without waiting for the whole page.
+
+    Rejects images whose real dimensions are below ``min_dimension`` and
+    images whose perceptual hash is within ``max_hash_distance`` bits of an
+    image already admitted (the same photo at another resolution or
+    re-encoded). When two copies arrive, the first one to finish
+    downloading is kept.
+    """
+
+    def __init__(self, min_dimension: int = 100, max_hash_distance: int = 4):
+        self.min_dimension = min_dimension
+        self.max_hash_distance = max_hash_distance
+        self._hashes: List[imagehash.ImageHash] = []
+        self._lock = threading.Lock()
+
+    def admit(self, url: str, image_bytes: bytes) -> bool:
+        """Return True if the image should be analyzed, remembering its hash"""
+        try:
+            width, height, phash = sniff_image(image_bytes)
+        except Exception as e:
+            logger.info(f"Skipping undecodable image {url}: {str(e)}")
+            return False
+
+        if width < self.min_dimension or height < self.min_dimension:
+            return False
+        with self._lock:
+            if any(phash - seen <= self.max_hash_distance for seen in self._hashes):
+                return False
+            self._hashes.append(phash)
+        return True
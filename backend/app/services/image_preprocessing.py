@@ -0,0 +1,51 @@
+from io import BytesIO
+from typing import List, Tuple
+
+import numpy as np
+from PIL import Image
+
+RESAMPLE_FILTERS = {
+    "nearest": Image.Resampling.NEAREST,
+    "bilinear": Image.Resampling.BILINEAR,
+    "bicubic": Image.Resampling.BICUBIC,
+    "lanczos": Image.Resampling.LANCZOS
+}
+
+
+def decode_for_embedding(
+    image_bytes: bytes,
+    size: Tuple[int, int] = (224, 224),
+    resample: str = "bilinear"
+) -> np.ndarray:
+    """
+    Decode an image straight to a ``size`` RGB uint8 array.
+
+    JPEGs are decoded at a reduced DCT scale with ``Image.draft`` so a large
+    news photo is never fully decompressed, and other formats are shrunk with
+    ``reduce`` before the final resample. Normalization to float happens
+    later, once per batch.
+    """
+    image = Image.open(BytesIO(image_bytes))
+
+    # Only JPEG supports draft mode; it is a no-op for other formats
+    image.draft('RGB', size)
+
+    # Convert to RGB if needed
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+
+    image = image.resize(size, RESAMPLE_FILTERS[resample], reducing_gap=2.0)
+    return np.asarray(image, dtype=np.uint8)
+
+
+def fill_batch(image_arrays: List[np.ndarray], out: np.ndarray) -> np.ndarray:
+    """
+    Copy uint8 images into the float32 buffer ``out`` and scale to [0, 1].
+
+    Returns the view of ``out`` that holds the batch.
+    """
+    batch = out[:len(image_arrays)]
+    for i, image_array in enumerate(image_arrays):
+        batch[i] = image_array
+    np.multiply(batch, np.float32(1.0 / 255.0), out=batch)
+    return batch
@@ -0,0 +1,146 @@
+import hashlib
+import logging
+import math
+import re
+from collections import Counter
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+_TERM = re.compile(r"[a-z][a-z'\-]*[a-z]")
+
+STOP_WORDS = frozenset("""
+a about above after again against all also am an and any are as at be because been before being
+below between both but by can could did do does doing down during each few for from further had
+has have having he her here hers herself him himself his how i if in into is it its itself just
+more most my myself no nor not now of off on once only or other our ours ourselves out over own
+said same says she should so some such than that the their theirs them themselves then there
+these they this those through to too under until up very was we were what when where which while
+who whom why will with would you your yours yourself yourselves it's don't he's she's they're
+we're i'm one two new according told year years mr mrs ms
+""".split())
+
+
+def tokenize_terms(text: str) -> List[str]:
+    """Lowercase word terms of at least three letters, without stop words"""
+    return [
+        term for term in _TERM.findall(text.lower())
+        if len(term) > 2 and term not in STOP_WORDS
+    ]
+
+
+class KeywordExtractor:
+    """
+    TF-IDF keyword extraction against precomputed corpus statistics.
+
+    Document frequencies are computed once from the ``news_articles`` corpus
+    (see ``scripts/build_keyword_idf.py``) and loaded as a term index plus a
+    float32 IDF vector. A batch of texts is scored as one sparse term matrix:
+    term ids and row ids for the whole batch are concatenated, counted with
+    a single ``np.unique`` and ranked per row with one ``lexsort``, so the
+    per-text cost is dominated by the regex tokenization. Terms missing from
+    the table get the IDF of a term seen in a single document. Without a
+    table every term has the same IDF, which ranks by frequency.
+    """
+
+    def __init__(self, idf_path: Optional[Path] = None, top_k: int = 5):
+        self.top_k = top_k
+        self.vocabulary: Dict[str, int] = {}
+        self.terms: List[str] = []
+        self.idf = np.zeros(0, dtype=np.float32)
+        self.unknown_idf = 1.0
+        self.version = "none"
+
+        if idf_path is not None and Path(idf_path).exists():
+            try:
+                self._load(Path(idf_path))
+            except Exception as e:
+                logger.error(f"Error loading keyword IDF table {idf_path}: {str(e)}")
+        elif idf_path is not None:
+            logger.warning(f"Keyword IDF table {idf_path} not found, ranking keywords by frequency")
+
+    def _load(self, idf_path: Path):
+        with np.load(idf_path, allow_pickle=False) as data:
+            self.terms = data["terms"].tolist()
+            self.idf = data["idf"].astype(np.float32)
+            document_count = int(data["document_count"])
+        self.vocabulary = {term: i for i, term in enumerate(self.terms)}
+        self.unknown_idf = math.log((1 + document_count) / 2) + 1
+        with open(idf_path, 'rb') as f:
+            self.version = hashlib.sha256(f.read()).hexdigest()[:16]
+        logger.info(f"Loaded keyword IDF table with {len(self.terms)} terms from {document_count} documents")
+
+    def extract_batch(self, texts: List[str]) -> List[List[str]]:
+        """Return the ``top_k`` highest scoring terms of each text, best first"""
+        if not texts:
+            return []
+
+        # Terms outside the table get batch-local ids after the vocabulary
+        local_terms: Dict[str, int] = {}
+        term_ids: List[int] = []
+        row_ids: List[int] = []
+        vocabulary_size = len(self.vocabulary)
+        for row, text in enumerate(texts):
+            terms = tokenize_terms(text)
+            for term in terms:
+                term_id = self.vocabulary.get(term)
+                if term_id is None:
+                    term_id = local_terms.setdefault(term, vocabulary_size + len(local_terms))
+                term_ids.append(term_id)
+            row_ids.extend([row] * len(terms))
+
+        if not term_ids:
+            return [[] for _ in texts]
+
+        # Sparse (row, term) counts for the whole batch in one pass
+        width = vocabulary_size + len(local_terms)
+        codes = np.asarray(row_ids, dtype=np.int64) * width + np.asarray(term_ids, dtype=np.int64)
+        codes, counts = np.unique(codes, return_counts=True)
+        rows = codes // width
+        cols = codes % width
+        idf = np.full(len(cols), self.unknown_idf, dtype=np.float32)
+        known = cols < vocabulary_size
+        idf[known] = self.idf[cols[known]]
+        scores = (1.0 + np.log(counts)) * idf
+
+        # Rank within each row: by row, then score descending, then term id
+        order = np.lexsort((cols, -scores, rows))
+        rows, cols = rows[order], cols[order]
+        row_starts = np.searchsorted(rows, np.arange(len(texts)))
+        rank = np.arange(len(rows)) - row_starts[rows]
+        keep = rank < self.top_k
+
+        batch_terms = list(local_terms)
+        keywords: List[List[str]] = [[] for _ in texts]
+        for row, col in zip(rows[keep].tolist(), cols[keep].tolist()):
+            keywords[row].append(self.terms[col] if col < vocabulary_size else batch_terms[col - vocabulary_size])
+        return keywords
+
+
+def build_idf_table(texts: Iterable[str], output_path: Path, min_df: int = 2, max_terms: int = 100000) -> int:
+    """
+    Compute document frequencies over ``texts`` and save the IDF table.
+
+    Terms seen in fewer than ``min_df`` documents are dropped and only the
+    ``max_terms`` most frequent ones are kept. Returns the number of
+    documents.
+    """
+    document_frequency: Counter = Counter()
+    document_count = 0
+    for text in texts:
+        document_frequency.update(set(tokenize_terms(text)))
+        document_count += 1
+
+    terms = [term for term, df in document_frequency.most_common(max_terms) if df >= min_df]
+    df = np.array([document_frequency[term] for term in terms], dtype=np.float64)
+    # Smoothed IDF, as in scikit-learn's TfidfVectorizer
+    idf = (np.log((1 + document_count) / (1 + df)) + 1).astype(np.float32)
+
+    output_path = Path(output_path)
+    output_path.parent.mkdir(parents=True, exist_ok=True)
+    with open(output_path, 'wb') as f:
+        np.savez(f, terms=np.array(terms, dtype=str), idf=idf, document_count=document_count)
+    return document_count
@@ -0,0 +1,133 @@
+import asyncio
+import logging
+from concurrent.futures import Executor
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class MicroBatcher:
+    """
+    Groups concurrent single-item requests into batches for a model.
+
+    Callers ``await submit(item)``; a background worker collects queued items
+    until ``max_batch_size`` is reached or ``max_wait_ms`` has passed since the
+    first item arrived, runs ``process_batch`` on the whole list in a worker
+    thread (``executor``, or the loop's default one) and hands each result
+    back to its caller. ``process_batch`` must return one result per input
+    item, in order. Up to ``concurrency`` batches run at the same time.
+    """
+
+    def __init__(
+        self,
+        process_batch: Callable[[List[Any]], List[Any]],
+        max_batch_size: int = 32,
+        max_wait_ms: float = 5.0,
+        name: str = "batcher",
+        executor: Optional[Executor] = None,
+        concurrency: int = 1
+    ):
+        self.process_batch = process_batch
+        self.max_batch_size = max(1, max_batch_size)
+        self.max_wait = max_wait_ms / 1000.0
+        self.name = name
+        self.executor = executor
+        self.concurrency = max(1, concurrency)
+
+        self._queue: Optional[asyncio.Queue] = None
+        self._worker_tasks: List[asyncio.Task] = []
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.stats = {"items": 0, "batches": 0, "max_queue_depth": 0}
+        # Batch sizes bucketed by the next power of two
+        self.batch_size_histogram: Dict[int, int] = {}
+        # Queue depth seen by each submit, bucketed the same way
+        self.queue_depth_histogram: Dict[int, int] = {}
+
+    def _ensure_worker(self):
+        """Start the batching workers on the running loop if they are not running"""
+        loop = asyncio.get_running_loop()
+        if self._loop is not loop or not self._worker_tasks or any(task.done() for task in self._worker_tasks):
+            for task in self._worker_tasks:
+                task.cancel()
+            self._queue = asyncio.Queue()
+            self._loop = loop
+            self._worker_tasks = [loop.create_task(self._worker()) for _ in range(self.concurrency)]
+
+    async def submit(self, item: Any) -> Any:
+        """Queue ``item`` for the next batch and wait for its result"""
+        self._ensure_worker()
+        future = self._loop.create_future()
+        depth = self._queue.qsize()
+        self.stats["max_queue_depth"] = max(self.stats["max_queue_depth"], depth + 1)
+        bucket = self._bucket(depth)
+        self.queue_depth_histogram[bucket] = self.queue_depth_histogram.get(bucket, 0) + 1
+        self._queue.put_nowait((item, future))
+        return await future
+
+    @staticmethod
+    def _bucket(value: int) -> int:
+        """Smallest power of two >= value (0 stays 0)"""
+        return 1 << (value - 1).bit_length() if value > 0 else 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Return counters, current queue depth and batch-size/queue-depth histograms"""
+        batches = self.stats["batches"]
+        return {
+            "name": self.name,
+            "queue_depth": self._queue.qsize() if self._queue is not None else 0,
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait * 1000.0,
+            **self.stats,
+            "mean_batch_size": self.stats["items"] / batches if batches else 0.0,
+            "batch_size_histogram": {str(k): v for k, v in sorted(self.batch_size_histogram.items())},
+            "queue_depth_histogram": {str(k): v for k, v in sorted(self.queue_depth_histogram.items())}
+        }
+
+    async def _collect_batch(self) -> List[Tuple[Any, asyncio.Future]]:
+        """Wait for the first item, then gather more until full or the window closes"""
+        batch = [await self._queue.get()]
+        deadline = self._loop.time() + self.max_wait
+
+        while len(batch) < self.max_batch_size:
+            if not self._queue.empty():
+                batch.append(self._queue.get_nowait())
+                continue
+            remaining = deadline - self._loop.time()
+            if remaining <= 0:
+                break
+            try:
+                batch.append(await asyncio.wait_for(self._queue.get(), timeout=remaining))
+            except asyncio.TimeoutError:
+                break
+
+        # Callers that gave up (e.g. timed out) don't need a result
+        return [(item, future) for item, future in batch if not future.done()]
+
+    async def _worker(self):
+        while True:
+            batch = await self._collect_batch()
+            if not batch:
+                continue
+
+            items = [item for item, _ in batch]
+            self.stats["items"] += len(items)
+            self.stats["batches"] += 1
+            bucket = self._bucket(len(items))
+            self.batch_size_histogram[bucket] = self.batch_size_histogram.get(bucket, 0) + 1
+
+            try:
+                results = await self._loop.run_in_executor(self.executor, self.process_batch, items)
+                if len(results) != len(items):
+                    raise RuntimeError(
+                        f"{self.name}: process_batch returned {len(results)} results for {len(items)} items"
+                    )
+            except Exception as e:
+                logger.error(f"{self.name}: batch of {len(items)} failed: {str(e)}")
+                for _, future in batch:
+                    if not future.done():
+                        future.set_exception(e)
+                continue
+
+            for (_, future), result in zip(batch, results):
+                if not future.done():
+                    future.set_result(result)
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tarfile
+import tempfile
+import time
+from pathlib import Path
+from typing import Dict, List, Optional
+
+import requests
+
+logger = logging.getLogger(__name__)
+
+MOBILENET_V2_URL = 'https://tfhub.dev/google/imagenet/mobilenet_v2_130_224/classification/4'
+
+MANIFEST_NAME = "manifest.json"
+
+
+class ModelStore:
+    """
+    Local, checksummed store for downloaded model artifacts.
+
+    Each model lives in ``<root>/<name>/`` next to a ``manifest.json`` that
+    records the source URL and a SHA-256 for every file. A model is only
+    downloaded when it is missing; an entry that fails verification is moved
+    to ``<root>/quarantine/`` and fetched again, leaving other entries alone.
+    """
+
+    def __init__(self, root: Optional[Path] = None):
+        self.root = Path(root or os.getenv("MODEL_STORE_DIR", "cache/models"))
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.quarantine_dir = self.root / "quarantine"
+
+    def path_for(self, name: str) -> Path:
+        return self.root / name
+
+    def get(self, name: str, url: str) -> Path:
+        """
+        Return a verified local path for model ``name``, downloading it from
+        ``url`` if it is not in the store yet.
+        """
+        model_dir = self.path_for(name)
+
+        if model_dir.exists():
+            if self.verify(name):
+                return model_dir
+            self.quarantine(name)
+
+        self._download_tfhub(name, url)
+        return model_dir
+
+    def verify(self, name: str) -> bool:
+        """Check every file of ``name`` against the checksums in its manifest"""
+        model_dir = self.path_for(name)
+        manifest_path = model_dir / MANIFEST_NAME
+        try:
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+        except Exception as e:
+            logger.warning(f"Model store entry {name} has no readable manifest: {str(e)}")
+            return False
+
+        expected = manifest.get("files", {})
+        actual = self._checksum_files(model_dir)
+        if actual != expected:
+            logger.warning(f"Model store entry {name} failed checksum verification")
+            return False
+        return True
+
+    def quarantine(self, name: str) -> Path:
+        """Move a corrupt entry aside so it can be inspected and re-fetched"""
+        self.quarantine_dir.mkdir(parents=True, exist_ok=True)
+        target = self.quarantine_dir / f"{name}-{int(time.time())}"
+        shutil.move(str(self.path_for(name)), str(target))
+        logger.warning(f"Quarantined model store entry {name} to {target}")
+        return target
+
+    def _download_tfhub(self, name: str, url: str):
+        """Download a TF Hub model as a compressed SavedModel and add it to the store"""
+        logger.info(f"Downloading model {name} from {url}")
+        staging = Path(tempfile.mkdtemp(prefix=f".{name}-", dir=self.root))
+        try:
+            archive_path = staging / "model.tar.gz"
+            with requests.get(url, params={"tf-hub-format": "compressed"}, stream=True, timeout=60) as response:
+                response.raise_for_status()
+                with open(archive_path, 'wb') as f:
+                    for chunk in response.iter_content(chunk_size=1024 * 1024):
+                        f.write(chunk)
+
+            extract_dir = staging / name
+            extract_dir.mkdir()
+            with tarfile.open(archive_path, 'r:gz') as archive:
+                members = self._safe_members(archive, extract_dir)
+                if hasattr(tarfile, "data_filter"):
+                    # Python builds with extraction filters re-check every member
+                    archive.extractall(extract_dir, members=members, filter="data")
+                else:
+                    archive.extractall(extract_dir, members=members)
+
+            manifest = {
+                "name": name,
+                "url": url,
+                "downloaded_at": time.time(),
+                "files": self._checksum_files(extract_dir)
+            }
+            with open(extract_dir / MANIFEST_NAME, 'w') as f:
+                json.dump(manifest, f, indent=2)
+
+            # Rename into place so readers never see a half-written entry
+            os.replace(extract_dir, self.path_for(name))
+        finally:
+            shutil.rmtree(staging, ignore_errors=True)
+
+    @staticmethod
+    def _safe_members(archive: tarfile.TarFile, extract_dir: Path) -> List[tarfile.TarInfo]:
+        """
+        Members of a model archive, refusing anything that could write
+        outside ``extract_dir``: links, devices and paths that resolve
+        elsewhere. A SavedModel only holds regular files and directories.
+        """
+        root = extract_dir.resolve()
+        members = archive.getmembers()
+        for member in members:
+            if not (member.isfile() or member.isdir()):
+                raise ValueError(f"Unsafe member type in model archive: {member.name}")
+            target = (root / member.name).resolve()
+            if target != root and root not in target.parents:
+                raise ValueError(f"Unsafe path in model archive: {member.name}")
+        return members
+
+    @staticmethod
+    def _checksum_files(model_dir: Path) -> Dict[str, str]:
+        """SHA-256 of every file under ``model_dir`` except the manifest"""
+        checksums = {}
+        for path in sorted(model_dir.rglob("*")):
+            if not path.is_file() or (path.name == MANIFEST_NAME and path.parent == model_dir):
+                continue
+            digest = hashlib.sha256()
+            with open(path, 'rb') as f:
+                for chunk in iter(lambda: f.read(1024 * 1024), b""):
+                    digest.update(chunk)
+            checksums[path.relative_to(model_dir).as_posix()] = digest.hexdigest()
+        return checksums
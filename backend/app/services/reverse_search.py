@@ -1,4 +1,3 @@
-import aiohttp
 import base64
 from typing import Dict, Any, List
 import io
@@ -6,11 +5,13 @@ from PIL import Image
 import hashlib
 import os
 from pathlib import Path
+from app.services.http_client import get_http_client
 
 class ReverseImageSearch:
     def __init__(self):
         self.api_key = os.getenv("GOOGLE_VISION_API_KEY", "")
         self.search_engines = ["google", "bing"]
+        self.http_client = get_http_client()
         
     async def search(self, image_data: bytes) -> List[Dict[str, Any]]:
         """
@@ -73,23 +74,22 @@ class ReverseImageSearch:
             }]
         }
         
-        async with aiohttp.ClientSession() as session:
-            async with session.post(url, json=payload) as response:
-                if response.status != 200:
-                    return [{
-                        "error": f"API request failed with status {response.status}"
-                    }]
-                
-                data = await response.json()
-                
-                # Extract web detection results
-                web_detection = data.get("responses", [{}])[0].get("webDetection", {})
-                
+        async with self.http_client.session.post(url, json=payload) as response:
+            if response.status != 200:
                 return [{
-                    "url": match.get("url", ""),
-                    "title": match.get("title", ""),
-                    "score": match.get("score", 0.0)
-                } for match in web_detection.get("webEntities", [])]
+                    "error": f"API request failed with status {response.status}"
+                }]
+            
+            data = await response.json()
+            
+            # Extract web detection results
+            web_detection = data.get("responses", [{}])[0].get("webDetection", {})
+            
+            return [{
+                "url": match.get("url", ""),
+                "title": match.get("title", ""),
+                "score": match.get("score", 0.0)
+            } for match in web_detection.get("webEntities", [])]
     
     async def _search_bing(self, image_data: bytes) -> List[Dict[str, Any]]:
         """
@@ -0,0 +1,173 @@
+import logging
+import sqlite3
+
+logger = logging.getLogger(__name__)
+
+
+def has_table(conn: sqlite3.Connection, name: str) -> bool:
+    """Whether the database has a table called ``name``"""
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (name,)
+    ).fetchone() is not None
+
+
+def create_news_articles_schema(conn: sqlite3.Connection):
+    """
+    Create the news_articles table filled by scripts/scrape_news_sources.py,
+    the corpus for the keyword IDF table and bias evaluations. Articles are
+    unique by URL, so a re-scraped article replaces its row.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS news_articles (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            url TEXT NOT NULL UNIQUE,
+            title TEXT,
+            text TEXT NOT NULL,
+            authors TEXT,
+            publish_date TEXT,
+            content_hash TEXT,
+            source TEXT,
+            category TEXT,
+            created_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_news_articles_source ON news_articles(source)")
+
+
+def create_fact_check_schema(conn: sqlite3.Connection) -> bool:
+    """
+    Create the fact-check tables and the FTS5 index over claim and
+    explanation, kept in sync with fact_checks by triggers. Existing rows
+    are indexed the first time. ``source_url`` is unique; duplicates left
+    by older fetchers are removed when that index is added. Safe to run
+    on an up-to-date database.
+
+    Returns False if this SQLite build has no FTS5.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fact_checks (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            claim TEXT NOT NULL,
+            verdict TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            source TEXT NOT NULL,
+            source_url TEXT NOT NULL,
+            explanation TEXT NOT NULL,
+            date TEXT NOT NULL,
+            related_claims TEXT,
+            created_at TEXT NOT NULL,
+            updated_at TEXT NOT NULL
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS sources (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            name TEXT NOT NULL,
+            url TEXT NOT NULL,
+            description TEXT,
+            api_available BOOLEAN NOT NULL,
+            last_updated TEXT NOT NULL
+        )
+    """)
+    # Conditional-GET validators and the newest item seen, per fetched source
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS fetch_state (
+            source TEXT PRIMARY KEY,
+            url TEXT NOT NULL,
+            etag TEXT,
+            last_modified TEXT,
+            high_water_mark TEXT,
+            last_fetched TEXT NOT NULL
+        )
+    """)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fact_checks_claim ON fact_checks(claim)")
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_fact_checks_source ON fact_checks(source)")
+
+    # Each fact check is stored once per URL, so ingestion can upsert
+    unique_url = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_fact_checks_source_url'"
+    ).fetchone()
+    if not unique_url:
+        # Earlier fetchers added a row on every run; keep the newest per URL
+        removed = conn.execute("""
+            DELETE FROM fact_checks
+            WHERE id NOT IN (SELECT MAX(id) FROM fact_checks GROUP BY source_url)
+        """).rowcount
+        if removed:
+            logger.info(f"Removed {removed} duplicate fact checks")
+        conn.execute("CREATE UNIQUE INDEX idx_fact_checks_source_url ON fact_checks(source_url)")
+
+    exists = conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'fact_checks_fts'"
+    ).fetchone()
+    try:
+        conn.execute("""
+            CREATE VIRTUAL TABLE IF NOT EXISTS fact_checks_fts USING fts5(
+                claim,
+                explanation,
+                content='fact_checks',
+                content_rowid='id',
+                tokenize='porter unicode61'
+            )
+        """)
+    except sqlite3.OperationalError as e:
+        logger.warning(f"FTS5 unavailable, falling back to LIKE search: {str(e)}")
+        return False
+
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS fact_checks_fts_insert AFTER INSERT ON fact_checks BEGIN
+            INSERT INTO fact_checks_fts(rowid, claim, explanation)
+            VALUES (new.id, new.claim, new.explanation);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS fact_checks_fts_delete AFTER DELETE ON fact_checks BEGIN
+            INSERT INTO fact_checks_fts(fact_checks_fts, rowid, claim, explanation)
+            VALUES ('delete', old.id, old.claim, old.explanation);
+        END
+    """)
+    conn.execute("""
+        CREATE TRIGGER IF NOT EXISTS fact_checks_fts_update AFTER UPDATE ON fact_checks BEGIN
+            INSERT INTO fact_checks_fts(fact_checks_fts, rowid, claim, explanation)
+            VALUES ('delete', old.id, old.claim, old.explanation);
+            INSERT INTO fact_checks_fts(rowid, claim, explanation)
+            VALUES (new.id, new.claim, new.explanation);
+        END
+    """)
+    # Per-term document counts, used to pick the selective words of a query
+    conn.execute(
+        "CREATE VIRTUAL TABLE IF NOT EXISTS fact_checks_vocab USING fts5vocab(fact_checks_fts, 'row')"
+    )
+    if not exists:
+        conn.execute("INSERT INTO fact_checks_fts(fact_checks_fts) VALUES ('rebuild')")
+    return True
+
+
+def create_bias_analysis_schema(conn: sqlite3.Connection):
+    """
+    Create the bias_analysis table used by BiasResultCache. Databases
+    created before the result cache get its columns added, and the old
+    index on the full text is replaced by a unique one on the content
+    hash. Safe to run on an up-to-date database.
+    """
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS bias_analysis (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            text TEXT NOT NULL,
+            bias_score REAL NOT NULL,
+            bias_category TEXT NOT NULL,
+            confidence REAL NOT NULL,
+            keywords TEXT,
+            created_at TEXT NOT NULL,
+            content_hash BLOB,
+            model_version TEXT,
+            explanation TEXT
+        )
+    """)
+    columns = [row[1] for row in conn.execute("PRAGMA table_info(bias_analysis)")]
+    for column, column_type in (("content_hash", "BLOB"), ("model_version", "TEXT"), ("explanation", "TEXT")):
+        if column not in columns:
+            conn.execute(f"ALTER TABLE bias_analysis ADD COLUMN {column} {column_type}")
+    # Rows are looked up by content hash, not by text
+    conn.execute("DROP INDEX IF EXISTS idx_bias_analysis_text")
+    conn.execute("CREATE UNIQUE INDEX IF NOT EXISTS idx_bias_analysis_hash ON bias_analysis(content_hash)")
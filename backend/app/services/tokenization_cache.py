@@ -0,0 +1,67 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+
+
+class TokenizationCache:
+    """
+    Bounded LRU cache of tokenizer outputs keyed by a hash of the text.
+
+    The bound is on the total number of cached tokens rather than entries,
+    so a few long documents can't pin as much memory as thousands of
+    headlines. Entries are keyed by ``(kind, text)``, where ``kind``
+    separates differently configured tokenizer calls for the same text.
+    """
+
+    def __init__(self, max_tokens: int = 1_000_000):
+        self.max_tokens = max_tokens
+        self._entries: "OrderedDict[bytes, Tuple[Any, int]]" = OrderedDict()
+        self._tokens = 0
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0}
+
+    @staticmethod
+    def make_key(kind: str, text: str) -> bytes:
+        digest = hashlib.blake2b(digest_size=16)
+        digest.update(kind.encode())
+        digest.update(b"\0")
+        digest.update(text.encode("utf-8", "surrogatepass"))
+        return digest.digest()
+
+    def get(self, key: bytes) -> Optional[Any]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self._stats["misses"] += 1
+                return None
+            self._entries.move_to_end(key)
+            self._stats["hits"] += 1
+            return entry[0]
+
+    def set(self, key: bytes, value: Any, tokens: int):
+        """Store ``value``, which holds ``tokens`` tokens, evicting least recently used entries"""
+        if tokens > self.max_tokens:
+            return
+        with self._lock:
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._tokens -= previous[1]
+            self._entries[key] = (value, tokens)
+            self._tokens += tokens
+            while self._tokens > self.max_tokens:
+                _, (_, evicted_tokens) = self._entries.popitem(last=False)
+                self._tokens -= evicted_tokens
+                self._stats["evictions"] += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self._stats)
+            stats.update({
+                "entries": len(self._entries),
+                "tokens": self._tokens,
+                "max_tokens": self.max_tokens
+            })
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        return stats
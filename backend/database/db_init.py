@@ -1,8 +1,17 @@
-import sqlite3
+import sys
 from pathlib import Path
 import json
 from datetime import datetime
 
+# Allow importing the app package when run as `python database/db_init.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.database import get_database
+from app.services.schema import (
+    create_bias_analysis_schema,
+    create_fact_check_schema,
+    create_news_articles_schema
+)
+
 def init_database():
     """Initialize the SQLite database with required tables and initial data"""
     db_path = Path("database/news_articles.sqlite")
@@ -10,51 +19,24 @@ def init_database():
     # Create database directory if it doesn't exist
     db_path.parent.mkdir(parents=True, exist_ok=True)
     
-    # Connect to database
-    conn = sqlite3.connect(db_path)
+    # Everything is created in one transaction on the shared, WAL-mode pool
+    with get_database(db_path).write() as conn:
+        _create_tables(conn)
+    
+    print("Database initialized successfully!")
+
+def _create_tables(conn):
+    """Create every table and index, and seed the fact-check sources"""
     cursor = conn.cursor()
     
-    # Create fact checks table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS fact_checks (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            claim TEXT NOT NULL,
-            verdict TEXT NOT NULL,
-            confidence REAL NOT NULL,
-            source TEXT NOT NULL,
-            source_url TEXT NOT NULL,
-            explanation TEXT NOT NULL,
-            date TEXT NOT NULL,
-            related_claims TEXT,
-            created_at TEXT NOT NULL,
-            updated_at TEXT NOT NULL
-        )
-    """)
+    # Fact checks, sources and the full-text index, shared with FactCheckService
+    create_fact_check_schema(conn)
     
-    # Create sources table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS sources (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            name TEXT NOT NULL,
-            url TEXT NOT NULL,
-            description TEXT,
-            api_available BOOLEAN NOT NULL,
-            last_updated TEXT NOT NULL
-        )
-    """)
+    # Bias analysis results, shared with BiasResultCache
+    create_bias_analysis_schema(conn)
     
-    # Create bias analysis table
-    cursor.execute("""
-        CREATE TABLE IF NOT EXISTS bias_analysis (
-            id INTEGER PRIMARY KEY AUTOINCREMENT,
-            text TEXT NOT NULL,
-            bias_score REAL NOT NULL,
-            bias_category TEXT NOT NULL,
-            confidence REAL NOT NULL,
-            keywords TEXT,
-            created_at TEXT NOT NULL
-        )
-    """)
+    # Scraped articles, the corpus for keyword IDF and bias evaluation
+    create_news_articles_schema(conn)
     
     # Create media verification table
     cursor.execute("""
@@ -118,16 +100,7 @@ def init_database():
         ))
     
     # Create indexes for better query performance
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fact_checks_claim ON fact_checks(claim)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_fact_checks_source ON fact_checks(source)")
-    cursor.execute("CREATE INDEX IF NOT EXISTS idx_bias_analysis_text ON bias_analysis(text)")
     cursor.execute("CREATE INDEX IF NOT EXISTS idx_media_verification_hash ON media_verification(file_hash)")
-    
-    # Commit changes and close connection
-    conn.commit()
-    conn.close()
-    
-    print("Database initialized successfully!")
 
 if __name__ == "__main__":
     init_database() 
\ No newline at end of file
@@ -0,0 +1,91 @@
+#!/usr/bin/env python3
+"""
+Benchmark how saturated bias inference affects unrelated endpoints.
+
+A probe coroutine stands in for a cheap endpoint such as /health: it is
+scheduled every few milliseconds and its latency (time until it actually
+runs) is recorded while bias requests are kept in flight. The "inline"
+mode runs inference directly on the event loop, like the old
+analyze_text; "pool" uses the BiasDetector worker pool.
+
+Usage:
+    BIAS_INFERENCE_WORKERS=2 BIAS_TORCH_THREADS=4 python scripts/benchmark_bias_event_loop.py
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.bias_detector import BiasDetector
+
+SAMPLE_TEXT = (
+    "The government announced a sweeping new tax policy on Tuesday, which "
+    "critics called a shocking betrayal of working families while supporters "
+    "praised it as a long overdue fix for the economy. "
+) * 8
+
+async def _probe(latencies: List[float], stop: asyncio.Event, interval: float):
+    """Measure how late a trivial coroutine runs compared to when it was due"""
+    loop = asyncio.get_running_loop()
+    while not stop.is_set():
+        due = loop.time() + interval
+        await asyncio.sleep(interval)
+        latencies.append((loop.time() - due) * 1000)
+
+async def _run(detector: BiasDetector, mode: str, clients: int, duration: float, interval: float):
+    latencies: List[float] = []
+    completed = 0
+    stop = asyncio.Event()
+
+    async def client():
+        nonlocal completed
+        while not stop.is_set():
+            if mode == "inline":
+                detector._infer_texts([SAMPLE_TEXT])
+                # Yield once, as an async endpoint would between requests
+                await asyncio.sleep(0)
+            else:
+                await detector.analyze_text(SAMPLE_TEXT)
+            completed += 1
+
+    tasks = [asyncio.create_task(client()) for _ in range(clients)]
+    probe = asyncio.create_task(_probe(latencies, stop, interval))
+    await asyncio.sleep(duration)
+    stop.set()
+    await asyncio.gather(probe, *tasks)
+
+    return completed / duration, np.percentile(latencies, 50), np.percentile(latencies, 99)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--clients", type=int, default=16, help="Concurrent bias requests kept in flight")
+    parser.add_argument("--duration", type=float, default=10.0, help="Seconds per mode")
+    parser.add_argument("--interval-ms", type=float, default=5.0, help="Probe interval")
+    parser.add_argument("--modes", nargs="+", default=["inline", "pool"], choices=["inline", "pool"])
+    args = parser.parse_args()
+
+    # Every request repeats the same text, so bypass the result cache
+    os.environ["BIAS_RESULT_CACHE"] = "off"
+    detector = BiasDetector()
+
+    print("Bias Inference Event Loop Benchmark")
+    print("=" * 36)
+    print(f"workers={detector.num_workers} clients={args.clients}")
+    print(f"{'mode':>8} {'texts/sec':>10} {'probe p50 ms':>13} {'probe p99 ms':>13}")
+
+    for mode in args.modes:
+        throughput, p50, p99 = asyncio.run(
+            _run(detector, mode, args.clients, args.duration, args.interval_ms / 1000.0)
+        )
+        print(f"{mode:>8} {throughput:10.1f} {p50:13.2f} {p99:13.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark semantic claim lookup on random unit vectors: p50/p99 latency
+of the memory-mapped index and its recall@10 against an exact scan.
+
+Only the index is timed; embedding the query text is a separate, fixed
+cost of the sentence-transformers model.
+
+Usage:
+    python scripts/benchmark_claim_index.py
+    python scripts/benchmark_claim_index.py --sizes 100000 --dim 384 --nprobe 8 16 32
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.claim_index import ClaimIndex, build_index
+
+def clustered_vectors(rng: np.random.Generator, count: int, dim: int, topics: int = 2000) -> np.ndarray:
+    """Unit vectors grouped around topics, closer to real claim embeddings than uniform noise"""
+    centers = rng.standard_normal((topics, dim), dtype=np.float32)
+    vectors = centers[rng.integers(0, topics, count)]
+    vectors += 0.6 * rng.standard_normal((count, dim), dtype=np.float32)
+    return vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100000, 1000000])
+    parser.add_argument("--dim", type=int, default=384, help="Embedding size (all-MiniLM-L6-v2: 384)")
+    parser.add_argument("--nprobe", nargs="+", type=int, default=[16])
+    parser.add_argument("--queries", type=int, default=200)
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    print("Claim Index Benchmark")
+    print("=" * 30)
+    print(f"{'claims':>9} {'nprobe':>6} {'p50 ms':>8} {'p99 ms':>8} {'recall@10':>10}")
+
+    for size in args.sizes:
+        vectors = clustered_vectors(rng, size, args.dim)
+        ids = np.arange(1, size + 1)
+        # Queries are perturbed copies of stored claims, like a paraphrase
+        queries = vectors[rng.integers(0, size, args.queries)]
+        queries = queries + 0.3 * rng.standard_normal(queries.shape, dtype=np.float32) / np.sqrt(args.dim)
+
+        with tempfile.TemporaryDirectory() as directory:
+            start = time.perf_counter()
+            build_index(Path(directory), ids, vectors, "benchmark")
+            print(f"(built {size} claims in {time.perf_counter() - start:.1f}s)")
+
+            stored = np.load(Path(directory) / "vectors.npy", mmap_mode="r")
+            stored_ids = np.load(Path(directory) / "ids.npy")
+            scores = np.concatenate([stored[i:i + 65536] @ queries.T for i in range(0, size, 65536)])
+            exact = [set(stored_ids[np.argpartition(-column, 9)[:10]].tolist()) for column in scores.T]
+
+            for nprobe in args.nprobe:
+                index = ClaimIndex(Path(directory), nprobe=nprobe)
+                index.search(queries[0], 10)
+                latencies = []
+                hits = 0
+                for query, expected in zip(queries, exact):
+                    start = time.perf_counter()
+                    found, _ = index.search(query, 10)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    hits += len(expected & set(found.tolist()))
+                print(
+                    f"{size:>9} {nprobe:>6} {np.percentile(latencies, 50):8.2f} "
+                    f"{np.percentile(latencies, 99):8.2f} {hits / (10 * len(queries)):10.3f}"
+                )
+
+if __name__ == "__main__":
+    main()
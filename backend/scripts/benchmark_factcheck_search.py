@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Benchmark fact-check search: the old LIKE '%text%' scan vs the FTS5 index
+with BM25 ranking, on synthetic fact_checks tables of increasing size.
+
+The table is grown in place, so the 1M run reuses the first 100k rows.
+
+Usage:
+    python scripts/benchmark_factcheck_search.py
+    python scripts/benchmark_factcheck_search.py --sizes 10000 100000 --queries 50
+"""
+
+import argparse
+import asyncio
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime
+from pathlib import Path
+from typing import List
+
+import numpy as np
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.database import get_database
+from app.services.factcheck_service import FactCheckService
+
+SUBJECTS = [
+    "the governor", "a viral video", "the senator", "the prime minister", "a facebook post",
+    "the health ministry", "a whatsapp message", "the mayor", "the opposition leader", "a news channel"
+]
+VERBS = ["claims", "shows", "says", "suggests", "alleges", "reports", "implies", "states"]
+TOPICS = [
+    "unemployment", "vaccines", "inflation", "election fraud", "crime rates", "immigration",
+    "climate change", "tax cuts", "school funding", "fuel prices", "covid deaths", "border wall",
+    "minimum wage", "healthcare costs", "voter turnout", "gdp growth", "police budgets", "rainfall"
+]
+CHANGES = ["doubled", "fell sharply", "hit a record high", "was cut in half", "rose 40 percent", "never changed"]
+VERDICTS = ["true", "false", "misleading", "half-true", "unproven"]
+
+def random_claim(rng: random.Random) -> str:
+    return (
+        f"{rng.choice(SUBJECTS)} {rng.choice(VERBS)} that {rng.choice(TOPICS)} "
+        f"{rng.choice(CHANGES)} in {rng.randint(1990, 2024)} in district {rng.randint(1, 5000)}"
+    )
+
+def grow_table(db_path: Path, target: int, rng: random.Random):
+    """Insert synthetic fact checks until the table holds ``target`` rows"""
+    db = get_database(db_path)
+    current = db.fetchone("SELECT COUNT(*) FROM fact_checks")[0]
+    now = datetime.now().isoformat()
+    while current < target:
+        chunk = min(50000, target - current)
+        rows = []
+        for _ in range(chunk):
+            claim = random_claim(rng)
+            rows.append((
+                claim, rng.choice(VERDICTS), rng.random(), "synthetic",
+                f"https://example.org/{rng.getrandbits(48):x}",
+                f"Records show {random_claim(rng)}, contradicting the claim.",
+                now, "[]", now, now
+            ))
+        with db.write() as conn:
+            conn.executemany("""
+                INSERT INTO fact_checks (
+                    claim, verdict, confidence, source, source_url,
+                    explanation, date, related_claims, created_at, updated_at
+                ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+            """, rows)
+        current += chunk
+
+def measure(service: FactCheckService, queries: List[str]) -> List[float]:
+    latencies = []
+    for query in queries:
+        start = time.perf_counter()
+        asyncio.run(service.search_claims(query, max_results=5))
+        latencies.append((time.perf_counter() - start) * 1000)
+    return latencies
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", type=int, default=[100000, 1000000])
+    parser.add_argument("--queries", type=int, default=30, help="Queries per mode and size")
+    parser.add_argument("--db", help="Database file to grow (default: a temporary file)")
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    tmp_dir = tempfile.TemporaryDirectory()
+    db_path = Path(args.db) if args.db else Path(tmp_dir.name) / "factchecks.sqlite"
+    service = FactCheckService(db_path=db_path)
+    service.initialize()
+    queries = [random_claim(rng) for _ in range(args.queries)]
+
+    print("Fact-Check Search Benchmark")
+    print("=" * 30)
+    print(f"{'rows':>9} {'mode':>5} {'p50 ms':>9} {'p99 ms':>9}")
+
+    try:
+        for size in sorted(args.sizes):
+            start = time.perf_counter()
+            grow_table(db_path, size, rng)
+            print(f"(loaded {size} rows in {time.perf_counter() - start:.1f}s)")
+
+            for mode in ("like", "fts"):
+                service.fts_enabled = mode == "fts"
+                latencies = measure(service, queries)
+                print(
+                    f"{size:>9} {mode:>5} {np.percentile(latencies, 50):9.2f} "
+                    f"{np.percentile(latencies, 99):9.2f}"
+                )
+    finally:
+        service.db.close()
+        tmp_dir.cleanup()
+
+if __name__ == "__main__":
+    main()
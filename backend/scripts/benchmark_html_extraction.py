@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Benchmark image/caption extraction from news HTML: the old BeautifulSoup
+per-image find_next('figcaption') scan vs the single-pass extractor.
+
+Usage:
+    python scripts/benchmark_html_extraction.py saved_page1.html saved_page2.html
+    python scripts/benchmark_html_extraction.py --gallery-sizes 100 500 2000
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, Tuple
+
+from bs4 import BeautifulSoup
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.html_extractor import LXML_AVAILABLE, extract_images
+
+def legacy_extract(html: str) -> List[Tuple[Dict[str, str], str]]:
+    """The original extraction loop from ContentAnalyzer.analyze_url"""
+    soup = BeautifulSoup(html, 'html.parser')
+    images = []
+    for img in soup.find_all('img'):
+        caption = img.get('alt', '')
+        if not caption:
+            caption = img.get('title', '')
+        if not caption:
+            figcaption = img.find_next('figcaption')
+            if figcaption:
+                caption = figcaption.get_text(strip=True)
+        images.append((img.get('src'), caption))
+    return images
+
+def make_gallery_page(images: int) -> str:
+    """
+    A gallery article: captioned figures followed by an uncaptioned
+    thumbnail strip, where every find_next('figcaption') walks to the end
+    """
+    paragraphs = "<p>" + "Lorem ipsum dolor sit amet, consectetur adipiscing elit. " * 20 + "</p>"
+    figures = []
+    for i in range(images // 2):
+        alt = f' alt="Photo {i}"' if i % 5 == 0 else ""
+        figures.append(
+            f'<figure><img src="/media/photo-{i}.jpg"{alt} width="800" height="600">'
+            f'<figcaption>Caption for <em>photo {i}</em></figcaption></figure>{paragraphs}'
+        )
+    thumbnails = "".join(
+        f'<li><a href="/gallery/{i}"><img src="/media/thumb-{i}.jpg"></a><span>{i}</span></li>'
+        for i in range(images - images // 2)
+    )
+    return (
+        f"<html><head><title>Gallery</title></head><body>{''.join(figures)}"
+        f"<ul class=\"thumbs\">{thumbnails}</ul>{paragraphs * 10}</body></html>"
+    )
+
+def best_time(fn: Callable[[str], list], html: str, repeats: int) -> float:
+    timings = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        fn(html)
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("fixtures", nargs="*", help="Saved news HTML files")
+    parser.add_argument("--gallery-sizes", type=int, nargs="+", default=[100, 500, 2000])
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    pages = [(Path(path).name, Path(path).read_text(errors="replace")) for path in args.fixtures]
+    if not pages:
+        pages = [(f"gallery-{n}", make_gallery_page(n)) for n in args.gallery_sizes]
+
+    extractors = [
+        ("legacy bs4", legacy_extract),
+        ("html.parser", lambda html: extract_images(html, "html.parser")),
+    ]
+    if LXML_AVAILABLE:
+        extractors.append(("lxml", lambda html: extract_images(html, "lxml")))
+
+    print("HTML Extraction Benchmark (ms)")
+    print("=" * 30)
+    print(f"{'page':>16} {'KB':>7} {'images':>7} " + " ".join(f"{name:>12}" for name, _ in extractors))
+
+    for name, html in pages:
+        # Captions must match the legacy behaviour
+        expected = [caption for _, caption in legacy_extract(html)]
+        for extractor_name, fn in extractors[1:]:
+            actual = [caption for _, caption in fn(html)]
+            if actual != expected:
+                print(f"warning: {extractor_name} captions differ from legacy on {name}")
+
+        timings = [best_time(fn, html, args.repeats) * 1000 for _, fn in extractors]
+        print(
+            f"{name:>16} {len(html) / 1024:7.0f} {len(expected):7d} "
+            + " ".join(f"{t:12.1f}" for t in timings)
+        )
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,70 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark image decode + resize time per megapixel for embedding
+preprocessing: full decode with LANCZOS vs the reduced-resolution path.
+
+Usage:
+    python scripts/benchmark_image_decode.py --sizes 1280x720 1920x1080 4000x3000
+"""
+
+import argparse
+import sys
+import time
+from io import BytesIO
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.image_preprocessing import decode_for_embedding
+
+def full_decode(image_bytes: bytes) -> np.ndarray:
+    """The original preprocessing: full decode, RGB convert, LANCZOS resize"""
+    image = Image.open(BytesIO(image_bytes))
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    image = image.resize((224, 224), Image.Resampling.LANCZOS)
+    return np.array(image).astype(np.float32) / 255.0
+
+def make_jpeg(width: int, height: int) -> bytes:
+    """Build a photo-like JPEG (smooth gradients plus noise) of the given size"""
+    rng = np.random.default_rng(0)
+    x = np.linspace(0, 255, width, dtype=np.float32)
+    y = np.linspace(0, 255, height, dtype=np.float32)[:, None]
+    pixels = np.stack([x + 0 * y, y + 0 * x, (x + y) / 2], axis=-1)
+    pixels += rng.normal(0, 12, pixels.shape)
+    image = Image.fromarray(np.clip(pixels, 0, 255).astype(np.uint8))
+    buffer = BytesIO()
+    image.save(buffer, format="JPEG", quality=90)
+    return buffer.getvalue()
+
+def ms_per_megapixel(fn, image_bytes: bytes, megapixels: float, repeats: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeats):
+        fn(image_bytes)
+    elapsed = time.perf_counter() - start
+    return elapsed * 1000 / repeats / megapixels
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sizes", nargs="+", default=["1280x720", "1920x1080", "4000x3000"])
+    parser.add_argument("--repeats", type=int, default=20)
+    args = parser.parse_args()
+
+    print("Image Decode Benchmark (ms per megapixel)")
+    print("=" * 42)
+    print(f"{'size':>12} {'full+lanczos':>14} {'draft+bilinear':>16} {'speedup':>8}")
+
+    for size in args.sizes:
+        width, height = (int(v) for v in size.split("x"))
+        image_bytes = make_jpeg(width, height)
+        megapixels = width * height / 1e6
+
+        full = ms_per_megapixel(full_decode, image_bytes, megapixels, args.repeats)
+        fast = ms_per_megapixel(decode_for_embedding, image_bytes, megapixels, args.repeats)
+        print(f"{size:>12} {full:14.2f} {fast:16.2f} {full / fast:7.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Benchmark MobileNet image embedding throughput: batch-of-one vs batched.
+
+Usage:
+    python scripts/benchmark_image_embedding.py --images 128 --batch-sizes 8 16 32
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import tensorflow_hub as hub
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.model_store import ModelStore, MOBILENET_V2_URL
+
+def images_per_second(model, images: np.ndarray, batch_size: int) -> float:
+    """Embed all images in batches of ``batch_size`` and return throughput"""
+    start = time.perf_counter()
+    for i in range(0, len(images), batch_size):
+        model(images[i:i + batch_size]).numpy()
+    elapsed = time.perf_counter() - start
+    return len(images) / elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--images", type=int, default=128, help="Number of images to embed")
+    parser.add_argument("--batch-sizes", type=int, nargs="+", default=[8, 16, 32, 64])
+    parser.add_argument("--repeats", type=int, default=3, help="Runs per mode, best is reported")
+    args = parser.parse_args()
+
+    print("Image Embedding Benchmark")
+    print("=" * 30)
+
+    model = hub.load(str(ModelStore().get("mobilenet_v2_130_224", MOBILENET_V2_URL)))
+    rng = np.random.default_rng(0)
+    images = rng.random((args.images, 224, 224, 3), dtype=np.float32)
+
+    # Warm up so graph tracing isn't counted
+    model(images[:1]).numpy()
+    for batch_size in args.batch_sizes:
+        model(images[:batch_size]).numpy()
+
+    baseline = max(images_per_second(model, images, 1) for _ in range(args.repeats))
+    print(f"batch size  1: {baseline:8.1f} images/sec")
+
+    for batch_size in args.batch_sizes:
+        throughput = max(images_per_second(model, images, batch_size) for _ in range(args.repeats))
+        print(f"batch size {batch_size:2d}: {throughput:8.1f} images/sec ({throughput / baseline:.1f}x)")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,45 @@
+#!/usr/bin/env python3
+"""
+Embed fact-check claims and build the memory-mapped index used by
+semantic /search_factcheck queries.
+
+By default only claims added or changed since the last build are
+embedded and appended; --rebuild re-embeds everything and re-clusters
+the index, which also folds the appended claims into the inverted lists.
+
+Usage:
+    python scripts/build_claim_index.py
+    python scripts/build_claim_index.py --rebuild --output cache/claim_index
+"""
+
+import argparse
+import os
+import sys
+import time
+from pathlib import Path
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.claim_index import DEFAULT_EMBEDDING_MODEL, create_encoder, update_claim_index
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="database/news_articles.sqlite")
+    parser.add_argument("--output", default=os.getenv("CLAIM_INDEX_DIR", "cache/claim_index"))
+    parser.add_argument("--model", default=os.getenv("CLAIM_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL))
+    parser.add_argument("--rebuild", action="store_true", help="Re-embed every claim")
+    args = parser.parse_args()
+
+    print("Claim Embedding Index")
+    print("=" * 30)
+
+    start = time.perf_counter()
+    encode = create_encoder(args.model)
+    print(f"Loaded {args.model} in {time.perf_counter() - start:.1f}s")
+
+    start = time.perf_counter()
+    embedded = update_claim_index(Path(args.db), Path(args.output), encode, args.model, args.rebuild)
+    print(f"Embedded {embedded} claims -> {args.output} in {time.perf_counter() - start:.1f}s")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+#!/usr/bin/env python3
+"""
+Build the keyword IDF table used for bias explanations from the
+news_articles corpus, then time keyword extraction on a sample of it.
+
+Usage:
+    python scripts/build_keyword_idf.py
+    python scripts/build_keyword_idf.py --min-df 3 --output cache/keyword_idf.npz
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+from typing import Iterator
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.database import get_database
+from app.services.keyword_extractor import KeywordExtractor, build_idf_table
+from app.services.schema import has_table
+
+def iter_articles(db_path: Path, limit: int = 0) -> Iterator[str]:
+    """Stream article texts without loading the whole table"""
+    with get_database(db_path).connection() as conn:
+        query = "SELECT text FROM news_articles WHERE text != ''"
+        if limit:
+            query += f" LIMIT {int(limit)}"
+        for (text,) in conn.execute(query):
+            yield text
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--db", default="database/news_articles.sqlite")
+    parser.add_argument("--output", default="cache/keyword_idf.npz")
+    parser.add_argument("--min-df", type=int, default=2, help="Drop terms seen in fewer documents")
+    parser.add_argument("--max-terms", type=int, default=100000)
+    parser.add_argument("--sample", type=int, default=500, help="Articles to time extraction on")
+    args = parser.parse_args()
+
+    print("Keyword IDF Table")
+    print("=" * 30)
+
+    with get_database(Path(args.db)).connection() as conn:
+        if not has_table(conn, "news_articles"):
+            sys.exit(f"No news_articles table in {args.db}; run scripts/scrape_news_sources.py first")
+
+    start = time.perf_counter()
+    documents = build_idf_table(iter_articles(Path(args.db)), Path(args.output), args.min_df, args.max_terms)
+    print(f"{documents} documents -> {args.output} in {time.perf_counter() - start:.1f}s")
+
+    extractor = KeywordExtractor(Path(args.output))
+    sample = list(iter_articles(Path(args.db), args.sample))
+    if not sample:
+        return
+
+    start = time.perf_counter()
+    keywords = extractor.extract_batch(sample)
+    elapsed = time.perf_counter() - start
+    print(f"{len(extractor.vocabulary)} terms, extraction {elapsed / len(sample) * 1e6:.0f} us/text")
+    print(f"Example: {', '.join(keywords[0])}")
+
+if __name__ == "__main__":
+    main()
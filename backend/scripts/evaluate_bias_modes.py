@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Evaluate BiasDetector inference modes: latency, model memory and agreement
+with the fp32 baseline.
+
+A mode is a backend (torch or onnx), optionally with "-int8" quantization.
+
+Usage:
+    python scripts/evaluate_bias_modes.py --texts-file articles.txt
+    python scripts/evaluate_bias_modes.py --from-db 500 --modes torch onnx onnx-int8
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+from pathlib import Path
+from typing import List
+
+import numpy as np
+import torch
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.bias_detector import BiasDetector
+from app.services.database import get_database
+from app.services.schema import has_table
+
+SAMPLE_TEXTS = [
+    "The senator's reckless plan will destroy the economy and hurt every working family.",
+    "The committee approved the budget proposal by a vote of 7 to 4 on Tuesday.",
+    "SHOCKING: You won't believe what this celebrity said about the election!",
+    "Progressive lawmakers pushed for expanded healthcare access and climate action.",
+    "Conservative leaders called for lower taxes, border security and less regulation.",
+    "Officials said the bridge will reopen next month after repairs are completed.",
+]
+
+MODES = ["torch", "torch-int8", "onnx", "onnx-int8"]
+
+def load_texts(args) -> List[str]:
+    if args.texts_file:
+        with open(args.texts_file, 'r') as f:
+            return [line.strip() for line in f if line.strip()]
+    if args.from_db:
+        db_path = Path("database/news_articles.sqlite")
+        with get_database(db_path).connection() as conn:
+            if not has_table(conn, "news_articles"):
+                sys.exit(f"No news_articles table in {db_path}; run scripts/scrape_news_sources.py first")
+            rows = conn.execute(
+                "SELECT text FROM news_articles WHERE text != '' LIMIT ?",
+                (args.from_db,)
+            ).fetchall()
+        return [row[0] for row in rows]
+    return SAMPLE_TEXTS * 20
+
+def model_size_mb(detector: BiasDetector) -> float:
+    """Size of the serialized weights, which includes packed int8 weights"""
+    if detector.model is None:
+        return os.path.getsize(detector.backend.artifact_path) / (1024 * 1024)
+    buffer = io.BytesIO()
+    torch.save(detector.model.state_dict(), buffer)
+    return buffer.tell() / (1024 * 1024)
+
+def evaluate(mode: str, texts: List[str], repeats: int):
+    backend, _, quantization = mode.partition("-")
+    os.environ["BIAS_BACKEND"] = backend
+    os.environ["BIAS_QUANTIZATION"] = quantization or "none"
+    os.environ["BIAS_RESULT_CACHE"] = "off"
+    detector = BiasDetector()
+
+    # Warm up
+    detector._predict_probabilities(texts[:8])
+
+    single_latencies = []
+    for text in texts[:min(len(texts), 50)]:
+        start = time.perf_counter()
+        detector._predict_probabilities([text])
+        single_latencies.append((time.perf_counter() - start) * 1000)
+
+    batch_times = []
+    probabilities = None
+    for _ in range(repeats):
+        start = time.perf_counter()
+        probabilities = detector._predict_probabilities(texts)
+        batch_times.append(time.perf_counter() - start)
+
+    return {
+        "mode": mode,
+        "size_mb": model_size_mb(detector),
+        "p50_ms": np.percentile(single_latencies, 50),
+        "p99_ms": np.percentile(single_latencies, 99),
+        "texts_per_sec": len(texts) / min(batch_times),
+        "probabilities": np.stack(probabilities)
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--texts-file", help="File with one text per line")
+    parser.add_argument("--from-db", type=int, help="Use this many texts from the news_articles table")
+    parser.add_argument("--modes", nargs="+", default=["torch", "torch-int8"], choices=MODES)
+    parser.add_argument("--repeats", type=int, default=3)
+    args = parser.parse_args()
+
+    texts = load_texts(args)
+    print("Bias Model Mode Evaluation")
+    print("=" * 30)
+    print(f"{len(texts)} texts, torch threads={torch.get_num_threads()}")
+
+    results = [evaluate(mode, texts, args.repeats) for mode in args.modes]
+    baseline = results[0]["probabilities"]
+
+    print(f"{'mode':>10} {'size MB':>8} {'p50 ms':>8} {'p99 ms':>8} {'texts/s':>8} {'agree':>7} {'max |dp|':>9}")
+    for result in results:
+        probs = result["probabilities"]
+        agreement = float(np.mean(probs.argmax(axis=1) == baseline.argmax(axis=1)))
+        max_diff = float(np.abs(probs - baseline).max())
+        print(
+            f"{result['mode']:>10} {result['size_mb']:8.1f} {result['p50_ms']:8.2f} "
+            f"{result['p99_ms']:8.2f} {result['texts_per_sec']:8.1f} {agreement:7.1%} {max_diff:9.4f}"
+        )
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,34 @@
+"""
+Fetch new fact checks from the supported sources into the database.
+
+Runs are incremental: listings are requested with the ETag/Last-Modified
+of the previous run, parsing stops at the newest fact check already
+stored, and rows are upserted by source URL. Newly added claims are then
+embedded into the semantic search index.
+
+Usage:
+    python scripts/fetch_factcheck_articles.py
+    python scripts/fetch_factcheck_articles.py --full
+"""
+
+import argparse
 import asyncio
-import aiohttp
 from bs4 import BeautifulSoup
-import sqlite3
 from datetime import datetime
 import json
 from pathlib import Path
 import logging
-from typing import Dict, Any, List
+import os
+from typing import Dict, Any, List, Optional, Tuple
 import re
+import sys
+
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.claim_index import DEFAULT_EMBEDDING_MODEL, create_encoder, update_claim_index
+from app.services.database import get_database
+from app.services.http_client import get_http_client
+from app.services.schema import create_fact_check_schema
 
 # Configure logging
 logging.basicConfig(
@@ -17,8 +38,10 @@ logging.basicConfig(
 logger = logging.getLogger(__name__)
 
 class FactCheckFetcher:
-    def __init__(self):
+    def __init__(self, full_refresh: bool = False):
         self.db_path = Path("database/news_articles.sqlite")
+        # Ignore stored ETags and high-water marks and re-read every listed item
+        self.full_refresh = full_refresh
         self.sources = {
             "politifact": {
                 "url": "https://www.politifact.com/factchecks/",
@@ -44,69 +67,140 @@ class FactCheckFetcher:
     
     async def fetch_all_sources(self):
         """Fetch fact checks from all sources"""
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for source_name, source_info in self.sources.items():
-                tasks.append(self._fetch_source(session, source_name, source_info))
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            for source_name, result in zip(self.sources.keys(), results):
-                if isinstance(result, Exception):
-                    logger.error(f"Error fetching {source_name}: {result}")
-                else:
-                    logger.info(f"Successfully fetched {len(result)} articles from {source_name}")
+        db = get_database(self.db_path)
+        await db.run(self._create_schema)
+        tasks = []
+        for source_name, source_info in self.sources.items():
+            tasks.append(self._fetch_source(source_name, source_info))
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Process results
+        for source_name, result in zip(self.sources.keys(), results):
+            if isinstance(result, Exception):
+                logger.error(f"Error fetching {source_name}: {result}")
+            else:
+                logger.info(f"Successfully fetched {len(result)} new articles from {source_name}")
+    
+    def _create_schema(self):
+        with get_database(self.db_path).write() as conn:
+            create_fact_check_schema(conn)
     
     async def _fetch_source(
         self,
-        session: aiohttp.ClientSession,
         source_name: str,
         source_info: Dict[str, Any]
     ) -> List[Dict[str, Any]]:
-        """Fetch fact checks from a specific source"""
+        """
+        Fetch the new fact checks of a specific source.
+        
+        The listing is requested with the validators of the last run and
+        skipped on 304 Not Modified. Listings are newest first, so parsing
+        stops at the newest item stored last time (the high-water mark).
+        """
+        db = get_database(self.db_path)
+        url = source_info["url"]
         try:
-            async with session.get(source_info["url"]) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}")
-                
-                html = await response.text()
-                articles = await source_info["parser"](html)
-                
-                # Save to database
-                self._save_articles(source_name, articles)
-                
-                return articles
+            state = await db.run(self._load_state, source_name, url)
+            headers = {}
+            if state.get("etag"):
+                headers["If-None-Match"] = state["etag"]
+            if state.get("last_modified"):
+                headers["If-Modified-Since"] = state["last_modified"]
+            
+            # Listings are read through the shared client's size cap
+            result = await get_http_client().fetch_text(url, headers=headers)
+            if result.status == 304:
+                logger.info(f"{source_name} not modified since the last run")
+                return []
+            validators = (result.etag, result.last_modified)
+            
+            articles = await source_info["parser"](result.text)
+            new_articles = []
+            for article in articles:
+                if article["source_url"] == state.get("high_water_mark"):
+                    break
+                new_articles.append(article)
+            
+            # Save to database, together with the state for the next run
+            await db.run(self._save_articles, source_name, url, new_articles, validators)
+            
+            return new_articles
         except Exception as e:
             logger.error(f"Error fetching {source_name}: {e}")
             raise
     
-    def _save_articles(self, source: str, articles: List[Dict[str, Any]]):
-        """Save articles to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+    def _load_state(self, source: str, url: str) -> Dict[str, Optional[str]]:
+        """Validators and high-water mark from the last run, unless --full or the URL changed"""
+        if self.full_refresh:
+            return {}
+        row = get_database(self.db_path).fetchone(
+            "SELECT etag, last_modified, high_water_mark FROM fetch_state WHERE source = ? AND url = ?",
+            (source, url)
+        )
+        if row is None:
+            return {}
+        return {"etag": row[0], "last_modified": row[1], "high_water_mark": row[2]}
+    
+    def _save_articles(
+        self,
+        source: str,
+        url: str,
+        articles: List[Dict[str, Any]],
+        validators: Tuple[Optional[str], Optional[str]]
+    ):
+        """Upsert articles by source URL and record the fetch state, in one transaction"""
+        now = datetime.now().isoformat()
+        rows = [(
+            article["claim"],
+            article["verdict"],
+            article["confidence"],
+            source,
+            article["source_url"],
+            article["explanation"],
+            article["date"],
+            json.dumps(article.get("related_claims", [])),
+            now,
+            now
+        ) for article in articles]
         
-        for article in articles:
-            cursor.execute("""
-                INSERT OR REPLACE INTO fact_checks (
+        # Existing rows keep their id (and embedding) and are only rewritten
+        # when their content changed; an UPDATE also keeps the full-text
+        # index in sync via its trigger.
+        with get_database(self.db_path).write() as conn:
+            conn.executemany("""
+                INSERT INTO fact_checks (
                     claim, verdict, confidence, source, source_url,
                     explanation, date, related_claims, created_at, updated_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source_url) DO UPDATE SET
+                    claim = excluded.claim,
+                    verdict = excluded.verdict,
+                    confidence = excluded.confidence,
+                    explanation = excluded.explanation,
+                    related_claims = excluded.related_claims,
+                    updated_at = excluded.updated_at
+                WHERE (claim, verdict, confidence, explanation, related_claims)
+                    IS NOT (excluded.claim, excluded.verdict, excluded.confidence,
+                            excluded.explanation, excluded.related_claims)
+            """, rows)
+            conn.execute("""
+                INSERT INTO fetch_state (source, url, etag, last_modified, high_water_mark, last_fetched)
+                VALUES (?, ?, ?, ?, ?, ?)
+                ON CONFLICT(source) DO UPDATE SET
+                    url = excluded.url,
+                    etag = excluded.etag,
+                    last_modified = excluded.last_modified,
+                    high_water_mark = COALESCE(excluded.high_water_mark, high_water_mark),
+                    last_fetched = excluded.last_fetched
             """, (
-                article["claim"],
-                article["verdict"],
-                article["confidence"],
                 source,
-                article["source_url"],
-                article["explanation"],
-                article["date"],
-                json.dumps(article.get("related_claims", [])),
-                datetime.now().isoformat(),
-                datetime.now().isoformat()
+                url,
+                validators[0],
+                validators[1],
+                articles[0]["source_url"] if articles else None,
+                now
             ))
-        
-        conn.commit()
-        conn.close()
     
     async def _parse_politifact(self, html: str) -> List[Dict[str, Any]]:
         """Parse PolitiFact articles"""
@@ -154,9 +248,32 @@ class FactCheckFetcher:
         # TODO: Implement AltNews parsing
         return []
 
+    def index_new_claims(self):
+        """Embed newly saved claims into the semantic search index"""
+        model = os.getenv("CLAIM_EMBEDDING_MODEL", DEFAULT_EMBEDDING_MODEL)
+        try:
+            encode = create_encoder(model)
+        except ImportError:
+            logger.warning("sentence-transformers not installed, skipping the claim index")
+            return
+        directory = Path(os.getenv("CLAIM_INDEX_DIR", "cache/claim_index"))
+        embedded = update_claim_index(self.db_path, directory, encode, model)
+        logger.info(f"Added {embedded} new or changed claims to the claim index")
+
 async def main():
-    fetcher = FactCheckFetcher()
-    await fetcher.fetch_all_sources()
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--full", action="store_true",
+        help="Re-read every listed fact check, ignoring ETags and high-water marks"
+    )
+    args = parser.parse_args()
+    
+    fetcher = FactCheckFetcher(full_refresh=args.full)
+    try:
+        await fetcher.fetch_all_sources()
+    finally:
+        await get_http_client().close()
+    fetcher.index_new_claims()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
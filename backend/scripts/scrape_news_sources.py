@@ -1,16 +1,22 @@
 import asyncio
 import aiohttp
 from bs4 import BeautifulSoup
-import sqlite3
 from datetime import datetime
 import json
 from pathlib import Path
 import logging
 from typing import Dict, Any, List
 import re
+import sys
 from newspaper import Article
 import hashlib
 
+# Allow importing the app package when run as `python scripts/<name>.py`
+sys.path.append(str(Path(__file__).resolve().parent.parent))
+from app.services.database import get_database
+from app.services.http_client import get_http_client
+from app.services.schema import create_news_articles_schema
+
 # Configure logging
 logging.basicConfig(
     level=logging.INFO,
@@ -46,31 +52,29 @@ class NewsScraper:
     
     async def scrape_all_sources(self):
         """Scrape articles from all sources"""
-        async with aiohttp.ClientSession() as session:
-            tasks = []
-            for source_name, source_info in self.sources.items():
-                for category in source_info["categories"]:
-                    tasks.append(
-                        self._scrape_source_category(
-                            session,
-                            source_name,
-                            source_info["url"],
-                            category
-                        )
+        await get_database(self.db_path).run(self._create_schema)
+        tasks = []
+        for source_name, source_info in self.sources.items():
+            for category in source_info["categories"]:
+                tasks.append(
+                    self._scrape_source_category(
+                        source_name,
+                        source_info["url"],
+                        category
                     )
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Process results
-            for result in results:
-                if isinstance(result, Exception):
-                    logger.error(f"Error scraping: {result}")
-                else:
-                    logger.info(f"Successfully scraped {len(result)} articles")
+                )
+        
+        results = await asyncio.gather(*tasks, return_exceptions=True)
+        
+        # Process results
+        for result in results:
+            if isinstance(result, Exception):
+                logger.error(f"Error scraping: {result}")
+            else:
+                logger.info(f"Successfully scraped {len(result)} articles")
     
     async def _scrape_source_category(
         self,
-        session: aiohttp.ClientSession,
         source: str,
         base_url: str,
         category: str
@@ -80,33 +84,34 @@ class NewsScraper:
             # Construct category URL
             category_url = f"{base_url}/{category}"
             
-            async with session.get(category_url) as response:
-                if response.status != 200:
-                    raise Exception(f"HTTP {response.status}")
-                
-                html = await response.text()
-                article_urls = self._extract_article_urls(html, base_url)
-                
-                # Fetch and parse articles
-                articles = []
-                for url in article_urls[:10]:  # Limit to 10 articles per category
-                    try:
-                        article = await self._fetch_article(session, url)
-                        if article:
-                            article["source"] = source
-                            article["category"] = category
-                            articles.append(article)
-                    except Exception as e:
-                        logger.error(f"Error fetching article {url}: {e}")
-                
-                # Save to database
-                self._save_articles(articles)
-                
-                return articles
+            # Pages are read through the shared client's size cap
+            html = await get_http_client().get_text(category_url)
+            article_urls = self._extract_article_urls(html, base_url)
+            
+            # Fetch and parse articles
+            articles = []
+            for url in article_urls[:10]:  # Limit to 10 articles per category
+                try:
+                    article = await self._fetch_article(url)
+                    if article:
+                        article["source"] = source
+                        article["category"] = category
+                        articles.append(article)
+                except Exception as e:
+                    logger.error(f"Error fetching article {url}: {e}")
+            
+            # Save to database
+            await get_database(self.db_path).run(self._save_articles, articles)
+            
+            return articles
         except Exception as e:
             logger.error(f"Error scraping {source}/{category}: {e}")
             raise
     
+    def _create_schema(self):
+        with get_database(self.db_path).write() as conn:
+            create_news_articles_schema(conn)
+    
     def _extract_article_urls(self, html: str, base_url: str) -> List[str]:
         """Extract article URLs from the page"""
         soup = BeautifulSoup(html, 'html.parser')
@@ -135,71 +140,65 @@ class NewsScraper:
         ]
         return any(re.search(pattern, url) for pattern in article_patterns)
     
-    async def _fetch_article(
-        self,
-        session: aiohttp.ClientSession,
-        url: str
-    ) -> Dict[str, Any]:
+    async def _fetch_article(self, url: str) -> Dict[str, Any]:
         """Fetch and parse an article"""
         try:
-            async with session.get(url) as response:
-                if response.status != 200:
-                    return None
-                
-                html = await response.text()
-                
-                # Use newspaper3k to parse article
-                article = Article(url)
-                article.set_html(html)
-                article.parse()
-                
-                # Generate article hash
-                content_hash = hashlib.md5(
-                    (article.title + article.text).encode()
-                ).hexdigest()
-                
-                return {
-                    "url": url,
-                    "title": article.title,
-                    "text": article.text,
-                    "authors": article.authors,
-                    "publish_date": article.publish_date.isoformat() if article.publish_date else None,
-                    "content_hash": content_hash,
-                    "created_at": datetime.now().isoformat()
-                }
+            try:
+                html = await get_http_client().get_text(url)
+            except aiohttp.ClientResponseError:
+                return None
+            
+            # Use newspaper3k to parse article
+            article = Article(url)
+            article.set_html(html)
+            article.parse()
+            
+            # Generate article hash
+            content_hash = hashlib.md5(
+                (article.title + article.text).encode()
+            ).hexdigest()
+            
+            return {
+                "url": url,
+                "title": article.title,
+                "text": article.text,
+                "authors": article.authors,
+                "publish_date": article.publish_date.isoformat() if article.publish_date else None,
+                "content_hash": content_hash,
+                "created_at": datetime.now().isoformat()
+            }
         except Exception as e:
             logger.error(f"Error parsing article {url}: {e}")
             return None
     
     def _save_articles(self, articles: List[Dict[str, Any]]):
         """Save articles to the database"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        rows = [(
+            article["url"],
+            article["title"],
+            article["text"],
+            json.dumps(article["authors"]),
+            article["publish_date"],
+            article["content_hash"],
+            article["source"],
+            article["category"],
+            article["created_at"]
+        ) for article in articles]
         
-        for article in articles:
-            cursor.execute("""
+        with get_database(self.db_path).write() as conn:
+            conn.executemany("""
                 INSERT OR REPLACE INTO news_articles (
                     url, title, text, authors, publish_date,
                     content_hash, source, category, created_at
                 ) VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                article["url"],
-                article["title"],
-                article["text"],
-                json.dumps(article["authors"]),
-                article["publish_date"],
-                article["content_hash"],
-                article["source"],
-                article["category"],
-                article["created_at"]
-            ))
-        
-        conn.commit()
-        conn.close()
+            """, rows)
 
 async def main():
     scraper = NewsScraper()
-    await scraper.scrape_all_sources()
+    try:
+        await scraper.scrape_all_sources()
+    finally:
+        await get_http_client().close()
 
 if __name__ == "__main__":
     asyncio.run(main()) 
\ No newline at end of file
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Test script for GeminiClient against a local fake Gemini server.
+No API key or network access is needed.
+"""
+
+import asyncio
+import os
+import sys
+
+from aiohttp import web
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.gemini_client import GeminiClient
+from app.services.http_client import HTTPClient
+
+async def _start_fake_gemini_server(received):
+    """Start a fake generateContent endpoint that echoes the prompt back"""
+    async def generate_content(request):
+        payload = await request.json()
+        prompt = payload["contents"][0]["parts"][0]["text"]
+        received.append(prompt)
+        # Error responses: an HTML page from a proxy, or the API's JSON error
+        if prompt == "html error":
+            page = "<html><body>Service Unavailable</body></html>" + " " * 500
+            return web.Response(status=503, text=page, content_type="text/html")
+        if prompt == "json error":
+            return web.json_response({"error": {"message": "API key not valid"}}, status=400)
+        # Hold the request open briefly so concurrent callers overlap
+        await asyncio.sleep(0.05)
+        return web.json_response({
+            "candidates": [{"content": {"parts": [{"text": f"echo: {prompt}"}]}}]
+        })
+
+    app = web.Application()
+    app.router.add_post("/v1beta/models/{model_action}", generate_content)
+    runner = web.AppRunner(app)
+    await runner.setup()
+    site = web.TCPSite(runner, "127.0.0.1", 0)
+    await site.start()
+    port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://127.0.0.1:{port}"
+
+async def _run_gemini_client_test():
+    received = []
+    runner, base_url = await _start_fake_gemini_server(received)
+    http_client = HTTPClient()
+    try:
+        client = GeminiClient("test-key", base_url=base_url, http_client=http_client)
+
+        # Two distinct prompts run concurrently, duplicates share one request
+        results = await asyncio.gather(
+            client.generate("caption prompt"),
+            client.generate("caption prompt"),
+            client.generate("reverse search prompt"),
+        )
+
+        assert results == [
+            "echo: caption prompt",
+            "echo: caption prompt",
+            "echo: reverse search prompt",
+        ]
+        assert sorted(received) == ["caption prompt", "reverse search prompt"]
+        assert client.stats == {"requests": 2, "coalesced": 1}
+
+        # Once a request completes, the same prompt is sent again
+        await client.generate("caption prompt")
+        assert client.stats["requests"] == 3
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+async def _run_gemini_error_test():
+    runner, base_url = await _start_fake_gemini_server([])
+    http_client = HTTPClient()
+    try:
+        client = GeminiClient("test-key", base_url=base_url, http_client=http_client)
+
+        # The HTTP status is reported even when the body is not JSON
+        for prompt, expected in (
+            ("html error", "status 503: <html><body>Service Unavailable</body></html>"),
+            ("json error", "status 400: API key not valid"),
+        ):
+            try:
+                await client.generate(prompt)
+            except RuntimeError as e:
+                assert str(e).startswith(f"Gemini API request failed with {expected}"), str(e)
+                assert len(str(e)) < 300
+            else:
+                raise AssertionError(f"{prompt} did not raise")
+    finally:
+        await http_client.close()
+        await runner.cleanup()
+
+def test_gemini_client_coalesces_prompts():
+    asyncio.run(_run_gemini_client_test())
+
+def test_gemini_client_reports_error_status():
+    asyncio.run(_run_gemini_error_test())
+
+if __name__ == "__main__":
+    print("GeminiClient Test")
+    print("=" * 30)
+    test_gemini_client_coalesces_prompts()
+    test_gemini_client_reports_error_status()
+    print("\n✅ All tests passed!")
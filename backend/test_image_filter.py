@@ -0,0 +1,59 @@
+#!/usr/bin/env python3
+"""
+Test script for the markup-only image filters (srcset parsing and
+decorative image detection). No network access is needed.
+"""
+
+import os
+import sys
+
+# Add the backend directory to the Python path
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from app.services.image_filter import is_decorative, parse_srcset, resolve_image_url
+
+PAGE_URL = "https://news.example.com/story"
+
+def test_srcset_keeps_commas_inside_urls():
+    srcset = (
+        "https://res.cloudinary.com/demo/image/upload/w_400,c_fill/photo.jpg 400w, "
+        "https://res.cloudinary.com/demo/image/upload/w_800,c_fill/photo.jpg 800w"
+    )
+    assert parse_srcset(srcset) == [
+        ("https://res.cloudinary.com/demo/image/upload/w_400,c_fill/photo.jpg", 400.0),
+        ("https://res.cloudinary.com/demo/image/upload/w_800,c_fill/photo.jpg", 800.0),
+    ]
+    url = resolve_image_url({"srcset": srcset}, PAGE_URL, target_width=600)
+    assert url == "https://res.cloudinary.com/demo/image/upload/w_800,c_fill/photo.jpg"
+
+def test_srcset_density_descriptors():
+    # No descriptor means 1x; densities sort below widths in their own order
+    assert parse_srcset("/a.jpg, /b,x.jpg 2x,/c.jpg 1.5x") == [
+        ("/a.jpg", -1.0),
+        ("/b,x.jpg", -0.5),
+        ("/c.jpg", -1.0 / 1.5),
+    ]
+    url = resolve_image_url({"srcset": "/a.jpg 1x, /b.jpg 2x"}, PAGE_URL, target_width=800)
+    assert url == "https://news.example.com/b.jpg"
+
+def test_srcset_without_valid_candidates_falls_back_to_src():
+    assert parse_srcset("/a.jpg 400q, /b.jpg 2x 300w") == []
+    url = resolve_image_url({"srcset": "/a.jpg 400q", "src": "/photo.jpg"}, PAGE_URL, target_width=800)
+    assert url == "https://news.example.com/photo.jpg"
+
+def test_only_pixel_sizes_mark_small_images():
+    url = "https://news.example.com/photos/flood.jpg"
+    assert is_decorative({"width": "50"}, url, min_dimension=100)
+    assert is_decorative({"width": "50px"}, url, min_dimension=100)
+    # Relative and keyword sizes say nothing about the rendered pixels
+    for width in ("50%", "10em", "auto"):
+        assert not is_decorative({"width": width}, url, min_dimension=100)
+
+if __name__ == "__main__":
+    print("Image Filter Test")
+    print("=" * 30)
+    test_srcset_keeps_commas_inside_urls()
+    test_srcset_density_descriptors()
+    test_srcset_without_valid_candidates_falls_back_to_src()
+    test_only_pixel_sizes_mark_small_images()
+    print("\n✅ All tests passed!")